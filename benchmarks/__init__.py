@@ -0,0 +1 @@
+"""Benchmarks for the generator and the generated persistence layer."""
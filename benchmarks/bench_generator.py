@@ -0,0 +1,93 @@
+"""Generator benchmarks: YAML load and resolution, template rendering, generate()."""
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from botecopro_meta import generator as gen
+from botecopro_meta.generator import (
+    TEMPLATES_PATH,
+    DomainLoader,
+    Generator,
+    generate,
+)
+
+from .synthetic import write_synthetic_domain
+from .timing import Result, measure
+
+SAMPLE_DOMAIN = Path(__file__).resolve().parents[1] / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def bench_load(sizes: Sequence[int], repeat: int, workdir: Path) -> Iterator[Result]:
+    """YAML parse plus entity resolution, uncached and from the domain cache."""
+    for size in sizes:
+        path = write_synthetic_domain(workdir / f"domain_{size}.yaml", size)
+        yield Result(
+            "domain.load_resolve",
+            {"entities": size},
+            measure(lambda: DomainLoader(path).load(), repeat),
+        )
+        cache_dir = workdir / f"cache_{size}"
+        DomainLoader(path, cache_dir).load()
+        yield Result(
+            "domain.load_cached",
+            {"entities": size},
+            measure(lambda: DomainLoader(path, cache_dir).load(), repeat),
+        )
+
+
+def bench_templates(repeat: int) -> Iterator[Result]:
+    """Render time of each per-entity template over the sample domain."""
+    domain = DomainLoader(SAMPLE_DOMAIN).load()
+    generator = Generator(TEMPLATES_PATH)
+    renderers = {
+        "python_model.j2": lambda entity: generator.render_python(entity, domain.enums),
+        "sqlite_table.j2": generator.render_sql,
+        "python_repository.j2": generator.render_repository,
+    }
+    for template, render in renderers.items():
+        def render_all(render=render) -> None:
+            for entity in domain.entities:
+                render(entity)
+
+        yield Result(
+            "template.render",
+            {"template": template, "entities": len(domain.entities)},
+            measure(render_all, repeat),
+        )
+
+
+def bench_generate(sizes: Sequence[int], repeat: int, workdir: Path) -> Iterator[Result]:
+    """Full generate() into a fresh directory (cold) and again unchanged (warm)."""
+    for size in sizes:
+        path = write_synthetic_domain(workdir / f"generate_{size}.yaml", size)
+        counter = itertools.count()
+        target = {}
+
+        def fresh_output() -> None:
+            # A new output and cache directory, and no in-process environments.
+            gen._ENVIRONMENTS.clear()
+            target["dir"] = workdir / f"out_{size}_{next(counter)}"
+
+        yield Result(
+            "generate.cold",
+            {"entities": size},
+            measure(lambda: generate(path, target["dir"]), repeat, setup=fresh_output),
+        )
+        warm_dir = workdir / f"out_{size}_warm"
+        generate(path, warm_dir)
+        yield Result(
+            "generate.warm",
+            {"entities": size},
+            measure(lambda: generate(path, warm_dir), repeat),
+        )
+
+
+def run(sizes: Sequence[int], repeat: int, workdir: Path) -> Iterator[Result]:
+    yield from bench_load(sizes, repeat, workdir)
+    yield from bench_templates(repeat)
+    yield from bench_generate(sizes, repeat, workdir)
+
+
+__all__ = ["bench_generate", "bench_load", "bench_templates", "run"]
@@ -0,0 +1,247 @@
+"""SQLite workloads on the generated schema: POS, kitchen display and stock."""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import random
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator, List
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from botecopro_meta.generator import generate
+
+from .bench_generator import SAMPLE_DOMAIN
+from .timing import Result, measure
+
+PRODUCTS = 200
+ITEMS = 500  # menu size
+TICKETS = 5000
+CLOSE_LINES = 40  # line items on a comanda being closed
+
+
+def import_generated(python_dir: Path) -> ModuleType:
+    """Import a generated ``python`` package under a unique module name."""
+    name = f"bench_generated_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(
+        name, python_dir / "__init__.py", submodule_search_locations=[str(python_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class Workload:
+    """Generated package plus a seeded file database."""
+
+    def __init__(self, workdir: Path):
+        output_dir = workdir / "generated"
+        generate(SAMPLE_DOMAIN, output_dir)
+        self.package = import_generated(output_dir / "python")
+        self.database = importlib.import_module(f"{self.package.__name__}.database")
+        self.repositories = importlib.import_module(f"{self.package.__name__}.repositories")
+        self.projections = importlib.import_module(f"{self.package.__name__}.projections")
+        self.kitchen_queue = importlib.import_module(f"{self.package.__name__}.kitchen_queue")
+        self.money = importlib.import_module(f"{self.package.__name__}.money")
+        self.engine = self.database.create_engine(f"sqlite:///{workdir / 'bench.db'}")
+        self.database.create_schema(self.engine)
+        self.random = random.Random(42)
+        self.now = datetime(2024, 5, 10, 18, 0, 0)
+        self._seed()
+        self.close_lines = [
+            {
+                "quantity": self.random.randint(1, 4),
+                "unit_price_cents": self.random.randint(300, 9000),
+                "discount_percent": self.random.choice([None, 10.0]),
+                "tax_percent": 12.5,
+            }
+            for _ in range(CLOSE_LINES)
+        ]
+
+    def _seed(self) -> None:
+        repos = self.repositories
+        with self.engine.begin() as conn:
+            repos.ProductRepository(conn).bulk_insert(
+                [
+                    {"id": i, "name": f"product {i}", "stock_current": 1e6, "cost_price_cents": 100 + i}
+                    for i in range(1, PRODUCTS + 1)
+                ]
+            )
+            repos.ItemRepository(conn).bulk_insert(
+                [
+                    {"id": i, "name": f"item {i}", "item_type": "drink", "sale_price_cents": 1000 + i}
+                    for i in range(1, ITEMS + 1)
+                ]
+            )
+            recipes = []
+            for item_id in range(1, ITEMS + 1):
+                for product_id in self.random.sample(range(1, PRODUCTS + 1), 4):
+                    recipes.append({"item_id": item_id, "product_id": product_id, "quantity": 0.25})
+            repos.ItemProductRepository(conn).bulk_insert(recipes)
+
+            comanda_id = self.open_comanda(conn)
+            order_id = self.open_order(conn, comanda_id)
+            statuses = ["new"] * 50 + ["cooking"] * 30 + ["ready"] * 20 + ["delivered"] * 900
+            repos.KitchenTicketRepository(conn).bulk_insert(
+                [
+                    {
+                        "order_id": order_id,
+                        "status": statuses[i % len(statuses)],
+                        "created_at": self.now + timedelta(seconds=i),
+                    }
+                    for i in range(TICKETS)
+                ]
+            )
+
+    def open_comanda(self, conn) -> str:
+        comanda_id = uuid.uuid4().hex
+        conn.execute(
+            insert(self.package.Comanda.__table__),
+            {"id": comanda_id, "status": "open", "opened_at": self.now, "last_modified": self.now, "dirty": True},
+        )
+        return comanda_id
+
+    def open_order(self, conn, comanda_id: str) -> int:
+        result = conn.execute(
+            insert(self.package.Order.__table__),
+            {"comanda_id": comanda_id, "origin": "table", "status": "open", "created_at": self.now},
+        )
+        return result.inserted_primary_key[0]
+
+    def add_items(self, conn, order_id: int, count: int = 10) -> None:
+        self.repositories.OrderItemRepository(conn).bulk_insert(
+            [
+                {
+                    "order_id": order_id,
+                    "item_id": self.random.randint(1, ITEMS),
+                    "quantity": self.random.randint(1, 3),
+                    "unit_price_cents": 1200,
+                }
+                for _ in range(count)
+            ]
+        )
+
+    def comanda_cycle(self) -> None:
+        """Open a comanda, add 10 items, close it with totals and pay."""
+        comanda = self.package.Comanda.__table__
+        order = self.package.Order.__table__
+        order_item = self.package.OrderItem.__table__
+        with self.engine.begin() as conn:
+            comanda_id = self.open_comanda(conn)
+            order_id = self.open_order(conn, comanda_id)
+            self.add_items(conn, order_id)
+            total = conn.execute(
+                select(func.sum(order_item.c.quantity * order_item.c.unit_price_cents))
+                .join(order, order.c.id == order_item.c.order_id)
+                .where(order.c.comanda_id == comanda_id)
+            ).scalar()
+            conn.execute(
+                update(comanda)
+                .where(comanda.c.id == comanda_id)
+                .values(status="closed", subtotal_cents=total, total_cents=total, closed_at=self.now)
+            )
+            conn.execute(
+                insert(self.package.Payment.__table__),
+                {"comanda_id": comanda_id, "method": "card", "amount_cents": total},
+            )
+
+    def menu_orm(self) -> List[Any]:
+        """Active menu items as ORM instances."""
+        item = self.package.Item
+        with Session(self.engine) as session:
+            return session.scalars(select(item).where(item.active.is_(True)).order_by(item.name)).all()
+
+    def menu_records(self) -> List[Any]:
+        """Active menu items as generated ``ItemRecord`` tuples through Core."""
+        item = self.package.Item
+        with self.engine.connect() as conn:
+            items = self.repositories.ItemRepository(conn)
+            return items.records(items.record_select().where(item.active.is_(True)).order_by(item.name))
+
+    def kds_poll(self) -> None:
+        """What a kitchen screen reads on every refresh."""
+        with self.engine.connect() as conn:
+            conn.execute(
+                text(
+                    "SELECT id, order_id, status, created_at FROM kitchen_ticket "
+                    "WHERE status IN ('new', 'cooking', 'ready') ORDER BY created_at"
+                )
+            ).all()
+
+    def kds_board(self) -> None:
+        """The same refresh through the generated queue's partial indexes."""
+        with self.engine.connect() as conn:
+            self.kitchen_queue.board(conn)
+
+    def stock_consumption(self) -> None:
+        """Expand an order's items through their recipes into stock movements."""
+        with self.engine.begin() as conn:
+            order_id = self.open_order(conn, self.open_comanda(conn))
+            self.add_items(conn, order_id)
+            ids = conn.execute(
+                text("SELECT id FROM order_item WHERE order_id = :order_id"), {"order_id": order_id}
+            ).scalars()
+            self.projections.consume_for_order_items(conn, list(ids), created_at=self.now)
+
+    def close_decimal(self) -> int:
+        """Comanda total with per-line ``Decimal`` math, for comparison."""
+        cent = Decimal("0.01")
+        total = Decimal(0)
+        for line in self.close_lines:
+            gross = Decimal(line["quantity"]) * Decimal(line["unit_price_cents"]) / 100
+            discounted = gross * (1 - Decimal(str(line["discount_percent"] or 0)) / 100)
+            taxed = discounted * (1 + Decimal(str(line["tax_percent"] or 0)) / 100)
+            total += taxed.quantize(cent, rounding=ROUND_HALF_UP)
+        return int(total * 100)
+
+    def close_cents(self) -> int:
+        """The same total through the generated integer-cents ``money`` module."""
+        return self.money.totals(self.money.Lines.from_rows(self.close_lines)).total
+
+    def close(self) -> None:
+        self.engine.dispose()
+        for name in [m for m in sys.modules if m.split(".")[0] == self.package.__name__]:
+            del sys.modules[name]
+
+
+def bytes_per_row(load: Callable[[], List[Any]]) -> float:
+    """Memory still held per loaded row once ``load`` returns its list."""
+    load()  # warm statement caches so they are not counted
+    tracemalloc.start()
+    try:
+        rows = load()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return held / max(len(rows), 1)
+
+
+def run(repeat: int, workdir: Path, number: int = 20) -> Iterator[Result]:
+    workload = Workload(workdir)
+    try:
+        yield Result("sqlite.comanda_cycle", {"items": 10}, measure(workload.comanda_cycle, repeat, number))
+        for name, load in (("orm", workload.menu_orm), ("records", workload.menu_records)):
+            yield Result(
+                f"sqlite.menu_{name}",
+                {"items": ITEMS},
+                measure(load, repeat, number),
+                {"bytes_per_row": bytes_per_row(load)},
+            )
+        yield Result("sqlite.kds_poll", {"tickets": TICKETS}, measure(workload.kds_poll, repeat, number))
+        yield Result("sqlite.kds_board", {"tickets": TICKETS}, measure(workload.kds_board, repeat, number))
+        for name, close in (("decimal", workload.close_decimal), ("cents", workload.close_cents)):
+            yield Result(f"money.close_{name}", {"lines": CLOSE_LINES}, measure(close, repeat, number))
+        yield Result("sqlite.stock_consumption", {"items": 10}, measure(workload.stock_consumption, repeat, number))
+    finally:
+        workload.close()
+
+
+__all__ = ["Workload", "import_generated", "run"]
@@ -0,0 +1,91 @@
+"""Run the benchmark suite and emit JSON results.
+
+Usage::
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --sizes 20 200 --repeat 3 --compare previous.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from botecopro_meta.generator import GENERATOR_VERSION  # noqa: E402
+
+from . import bench_generator, bench_sqlite  # noqa: E402
+from .timing import Result  # noqa: E402
+
+SUITES = ("generator", "sqlite")
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="BotecoPro benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000], help="Synthetic domain sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per benchmark case")
+    parser.add_argument("--suite", choices=SUITES, action="append", help="Run only these suites")
+    parser.add_argument("--out", "-o", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="Previous JSON results to compare medians against")
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> Dict:
+    suites = args.suite or list(SUITES)
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory(prefix="boteco-bench-") as tmp:
+        workdir = Path(tmp)
+        if "generator" in suites:
+            (workdir / "generator").mkdir()
+            results += bench_generator.run(args.sizes, args.repeat, workdir / "generator")
+        if "sqlite" in suites:
+            (workdir / "sqlite").mkdir()
+            results += bench_sqlite.run(args.repeat, workdir / "sqlite")
+    return {
+        "meta": {
+            "generator_version": GENERATOR_VERSION,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": {result.key: result.to_dict() for result in results},
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """One line per shared case: medians and the current/baseline ratio."""
+    lines = []
+    for key, result in current["results"].items():
+        previous = baseline.get("results", {}).get(key)
+        if previous:
+            ratio = result["median"] / previous["median"] if previous["median"] else float("inf")
+            lines.append(
+                f"{key:<60} {previous['median'] * 1000:10.3f} ms -> "
+                f"{result['median'] * 1000:10.3f} ms  x{ratio:.2f}"
+            )
+    return lines
+
+
+def main(argv: Optional[Iterable[str]] = None) -> Dict:
+    args = parse_args(argv)
+    report = run(args)
+    for key, result in report["results"].items():
+        print(f"{key:<60} median {result['median'] * 1000:10.3f} ms")
+    if args.compare:
+        print()
+        print("\n".join(compare(report, json.loads(args.compare.read_text()))))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Synthetic domains of arbitrary size for generator benchmarks."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+import yaml
+
+ENUMS = {
+    "Status": ["open", "closed", "cancelled"],
+    "Kind": ["dish", "drink", "article"],
+}
+
+
+def synthetic_domain(entity_count: int) -> Dict:
+    """Domain with ``entity_count`` entities shaped like the sample ones.
+
+    Every entity has scalar, money, enum and sync columns; from the second
+    one on, each also references the two previous entities.
+    """
+    entities: Dict[str, Dict] = {}
+    for index in range(entity_count):
+        name = f"Entity{index:04d}"
+        attributes: Dict[str, Dict] = {
+            "id": {"type": "int", "primary_key": True, "autoincrement": True},
+            "name": {"type": "string", "required": True},
+            "description": {"type": "string", "nullable": True},
+            "price_cents": {"type": "money_cents", "nullable": True},
+            "quantity": {"type": "float", "nullable": True},
+            "status": {"type": "enum", "enum": "Status", "nullable": False},
+            "active": {"type": "bool", "default": True},
+            "last_modified": {"type": "timestamp", "nullable": True},
+            "dirty": {"type": "bool", "default": False},
+            "origin_device": {"type": "string", "nullable": True},
+        }
+        for back in (1, 2):
+            if index - back >= 0:
+                attributes[f"ref{back}_id"] = {
+                    "type": "relation",
+                    "target": f"Entity{index - back:04d}",
+                    "target_field": "id",
+                    "nullable": True,
+                }
+        entities[name] = {
+            "storage": {"table": f"entity_{index:04d}"},
+            "attributes": attributes,
+            "methods": ["recalculate"],
+        }
+
+    return {
+        "botecopro_domain": {
+            "version": 1.0,
+            "metadata": {"sync_fields": ["last_modified", "dirty", "origin_device"]},
+            "types": {
+                "money_cents": {"base": "int"},
+                "timestamp": {"base": "datetime"},
+            },
+            "enums": ENUMS,
+            "entities": entities,
+        }
+    }
+
+
+def write_synthetic_domain(path: Path, entity_count: int) -> Path:
+    path.write_text(yaml.safe_dump(synthetic_domain(entity_count), sort_keys=False))
+    return path
+
+
+__all__ = ["synthetic_domain", "write_synthetic_domain"]
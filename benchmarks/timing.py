@@ -0,0 +1,59 @@
+"""Timing helpers and the JSON result format shared by the benchmarks."""
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Result:
+    """Per-call wall times, in seconds, of one benchmark case."""
+
+    name: str
+    params: Dict[str, Any]
+    samples: List[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{key}={value}" for key, value in sorted(self.params.items()))
+        return f"{self.name}[{params}]" if params else self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "params": self.params,
+            "repeat": len(self.samples),
+            "unit": "s",
+            "min": min(self.samples),
+            "median": statistics.median(self.samples),
+            "mean": statistics.fmean(self.samples),
+            "max": max(self.samples),
+            **self.extra,
+        }
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int = 5,
+    number: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+) -> List[float]:
+    """Time ``func`` ``repeat`` times; each sample averages ``number`` calls.
+
+    ``setup`` runs before every sample and is not timed.
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+__all__ = ["Result", "measure"]
@@ -1,5 +0,0 @@
--- SQLite table for Category (table: category)
-CREATE TABLE IF NOT EXISTS category (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  name TEXT
-);
@@ -1,6 +0,0 @@
--- SQLite table for Customer (table: customer)
-CREATE TABLE IF NOT EXISTS customer (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  name TEXT,
-  customer_type TEXT
-);
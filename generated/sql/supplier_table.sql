@@ -1,8 +0,0 @@
--- SQLite table for Supplier (table: supplier)
-CREATE TABLE IF NOT EXISTS supplier (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  name TEXT,
-  email TEXT,
-  phone TEXT,
-  notes TEXT
-);
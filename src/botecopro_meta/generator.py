@@ -2,9 +2,17 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass, field
+import hashlib
+import keyword
+import os
+import pickle
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Tuple, Union
 
 import sys
 
@@ -12,34 +20,67 @@ sys.path.insert(0, "/usr/lib/python3/dist-packages")
 
 import yaml
 
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 try:
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from jinja2 import (
+        Environment,
+        FileSystemBytecodeCache,
+        FileSystemLoader,
+        select_autoescape,
+    )
 except ImportError:  # pragma: no cover - fallback renderer handles templates
     Environment = None
+    FileSystemBytecodeCache = None
     FileSystemLoader = None
     select_autoescape = None
 
+from .manifest import Manifest, content_digest
+from .timings import Timings, UnitTiming, phase, profiled, top_functions
+
+GENERATOR_VERSION = "0.1.0"
+TEMPLATES_PATH = Path(__file__).parent / "templates"
+CACHE_DIR_NAME = ".boteco-cache"
+DEFAULT_DATABASE_URL = "sqlite:///boteco.db"
+ASYNC_SQLITE_DRIVER = "sqlite+aiosqlite"
+DEFAULT_SQLITE_PRAGMAS = {
+    "busy_timeout": 5000,
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "foreign_keys": True,
+    "cache_size": -16000,
+    "mmap_size": 134217728,
+    "temp_store": "memory",
+}
+SYNC_DIRTY_FIELD = "dirty"
+SYNC_TIMESTAMP_FIELD = "last_modified"
+EVENT_TABLE = "domain_event"
+MONEY_SUFFIX = "_cents"
+
 BASE_TYPES = {
-    "int": {"python": "int", "sqlalchemy": "Integer", "sqlite": "INTEGER"},
-    "float": {"python": "float", "sqlalchemy": "Float", "sqlite": "REAL"},
-    "bool": {"python": "bool", "sqlalchemy": "Boolean", "sqlite": "BOOLEAN"},
-    "string": {"python": "str", "sqlalchemy": "String", "sqlite": "TEXT"},
-    "text": {"python": "str", "sqlalchemy": "Text", "sqlite": "TEXT"},
-    "uuid": {"python": "UUID", "sqlalchemy": "String", "sqlite": "TEXT"},
+    "int": {"python": "int", "sqlalchemy": "Integer", "sqlite": "INTEGER", "dart": "int"},
+    "float": {"python": "float", "sqlalchemy": "Float", "sqlite": "REAL", "dart": "double"},
+    "bool": {"python": "bool", "sqlalchemy": "Boolean", "sqlite": "BOOLEAN", "dart": "bool"},
+    "string": {"python": "str", "sqlalchemy": "String", "sqlite": "TEXT", "dart": "String"},
+    "text": {"python": "str", "sqlalchemy": "Text", "sqlite": "TEXT", "dart": "String"},
+    "uuid": {"python": "UUID", "sqlalchemy": "String", "sqlite": "TEXT", "dart": "String"},
     "datetime": {
         "python": "datetime",
         "sqlalchemy": "DateTime",
         "sqlite": "DATETIME",
+        "dart": "DateTime",
     },
     "timestamp": {
         "python": "datetime",
         "sqlalchemy": "DateTime",
         "sqlite": "DATETIME",
+        "dart": "DateTime",
     },
     "decimal": {
         "python": "Decimal",
         "sqlalchemy": "Numeric",
         "sqlite": "NUMERIC",
+        "dart": "double",
     },
 }
 
@@ -71,6 +112,8 @@ class AttributeDefinition:
     relation: Optional[Tuple[str, str]] = None  # (table, field)
     precision: Optional[int] = None
     scale: Optional[int] = None
+    index: Optional[bool] = None  # explicit opt-in/opt-out of a derived index
+    renamed_from: Optional[str] = None  # previous column name, for migrations
 
 
 @dataclass
@@ -82,6 +125,230 @@ class EntityDefinition:
     attributes: List[AttributeDefinition]
     indexes: List[Dict] = field(default_factory=list)
     methods: List[str] = field(default_factory=list)
+    renamed_from: Optional[str] = None  # previous table name, for migrations
+
+
+@dataclass
+class EventFieldDefinition:
+    """Payload field of a domain event."""
+
+    name: str  # key in the stored payload
+    python_name: str  # attribute name, suffixed with ``_`` for Python keywords
+    base_type: str
+    python_type: str
+    nullable: bool = True
+
+
+@dataclass
+class EventDefinition:
+    """Domain event with its aggregate and typed payload."""
+
+    name: str
+    aggregate: str
+    fields: List[EventFieldDefinition]
+    aggregate_field: Optional[str] = None  # payload field holding the aggregate id
+
+
+@dataclass
+class TotalsProjection:
+    """Line totals rolled up into a target row through an intermediate entity.
+
+    ``lines.line_fk`` references ``through`` and ``through.target_fk`` references
+    ``target``; rows of ``through`` whose status is in ``excluded_statuses``
+    are not counted.
+    """
+
+    kind: ClassVar[str] = "totals"
+
+    name: str
+    target_table: str
+    target_key: str
+    through_table: str
+    through_key: str
+    target_fk: str
+    lines_table: str
+    lines_key: str
+    line_fk: str
+    status: Optional[str] = None
+    excluded_statuses: List[str] = field(default_factory=list)
+    columns: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def derived_columns(self) -> Dict[str, List[str]]:
+        """Columns owned by the projection, per table."""
+        return {
+            self.target_table: [self.columns["subtotal"], self.columns["total"]],
+            self.lines_table: [self.columns["line_total"]],
+        }
+
+    @property
+    def anchor_table(self) -> str:
+        return self.lines_table
+
+
+@dataclass
+class LedgerConsumption:
+    """Recipe expansion turning order lines into outgoing movements."""
+
+    function_name: str
+    recipes_table: str
+    recipe_target_fk: str
+    recipe_item_fk: str
+    recipe_quantity: str
+    lines_table: str
+    lines_key: str
+    line_item_fk: str
+    line_quantity: str
+    movement_line_fk: str
+    movement_type: str
+    reason: Optional[str] = None
+
+
+@dataclass
+class LedgerProjection:
+    """Balance column kept as the signed sum of an append-only movements table.
+
+    Each movement adds ``signs[type] * quantity`` to the balance of the row
+    it references; snapshots record the balance as of a movement id. With a
+    ``sync_key`` (a unique id column) the movements are synchronised
+    append-only and the balance is recomputed by the receiving database's
+    triggers.
+    """
+
+    kind: ClassVar[str] = "ledger"
+
+    name: str
+    target_table: str
+    target_key: str
+    balance: str
+    balance_type: str
+    movements_table: str
+    movements_key: str
+    movement_fk: str
+    quantity: str
+    type_field: str
+    signs: Dict[str, int]
+    created_field: Optional[str] = None
+    consume: Optional[LedgerConsumption] = None
+    sync_key: Optional[str] = None
+
+    @property
+    def synced(self) -> bool:
+        return self.sync_key is not None
+
+    @property
+    def snapshot_table(self) -> str:
+        return f"{self.name}_snapshot"
+
+    @property
+    def derived_columns(self) -> Dict[str, List[str]]:
+        """Columns owned by the projection, per table."""
+        return {self.target_table: [self.balance]}
+
+    @property
+    def anchor_table(self) -> str:
+        return self.movements_table
+
+
+Projection = Union[TotalsProjection, LedgerProjection]
+
+
+@dataclass
+class RecipeCacheDefinition:
+    """In-process cache of parent -> (component, quantity) rows.
+
+    ``recipes_table`` links ``parent_fk`` to ``component_fk`` with a
+    ``quantity``; ``cost`` is the component column costed per unit.
+    """
+
+    name: str
+    class_name: str
+    recipes_table: str
+    parent_fk: str
+    component_fk: str
+    quantity: str
+    component_table: str
+    component_key: str
+    cost: Optional[str] = None
+
+    @property
+    def counted_tables(self) -> Dict[str, Optional[List[str]]]:
+        """Tables whose changes invalidate the cache, with the columns that matter.
+
+        ``None`` counts every update; inserts and deletes always count.
+        """
+        tables: Dict[str, Optional[List[str]]] = {self.recipes_table: None}
+        if self.cost:
+            tables[self.component_table] = [self.cost]
+        return tables
+
+
+TOTALS_COLUMNS = {
+    "quantity": "quantity",
+    "unit_price": "unit_price_cents",
+    "discount_percent": "discount_percent",
+    "tax_percent": "tax_percent",
+    "line_total": "total_cents",
+    "subtotal": "subtotal_cents",
+    "total": "total_cents",
+}
+
+
+@dataclass
+class QueueDefinition:
+    """Status-driven work queue over an entity (e.g. kitchen tickets).
+
+    Rows move along ``flow``; every status but the last is active and gets a
+    partial index ordered by ``order_by``.
+    """
+
+    name: str
+    entity: str
+    table: str
+    key: str
+    status: str
+    order_by: str
+    flow: List[str]
+
+    @property
+    def active(self) -> List[str]:
+        return self.flow[:-1]
+
+
+@dataclass
+class ReportDefinition:
+    """Sales reports kept as per-day aggregates over exported columns.
+
+    Revenue and top items come from a totals projection's lines, bucketed by
+    ``order_at`` on its ``through`` entity; the payment mix and the waste (the
+    losses among ``waste_signs`` movements of a ledger) are optional.
+    ``watermarks`` names the column each table's incremental scan resumes
+    after: ``last_modified`` where present, else (and always for ledger
+    movements) the key of an append-only table.
+    """
+
+    name: str
+    orders_table: str
+    orders_key: str
+    order_at: str
+    order_status: Optional[str]
+    excluded_statuses: List[str]
+    lines_table: str
+    line_fk: str
+    item_fk: str
+    quantity: str
+    line_total: str
+    payments_table: Optional[str] = None
+    payment_method: Optional[str] = None
+    payment_amount: Optional[str] = None
+    payment_at: Optional[str] = None
+    movements_table: Optional[str] = None
+    movement_fk: Optional[str] = None
+    movement_quantity: Optional[str] = None
+    movement_type: Optional[str] = None
+    movement_at: Optional[str] = None
+    waste_signs: Dict[str, int] = field(default_factory=dict)
+    watermarks: Dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
@@ -92,16 +359,133 @@ class DomainDefinition:
     enums: Dict[str, EnumDefinition]
     entities: List[EntityDefinition]
     custom_types: Dict[str, Dict]
+    metadata: Dict = field(default_factory=dict)
+    targets: Dict = field(default_factory=dict)
+    events: List[EventDefinition] = field(default_factory=list)
+    projections: List[Projection] = field(default_factory=list)
+    caches: List[RecipeCacheDefinition] = field(default_factory=list)
+    queues: List[QueueDefinition] = field(default_factory=list)
+    reports: List[ReportDefinition] = field(default_factory=list)
+    version: Optional[str] = None
+
+    @property
+    def counted_tables(self) -> Dict[str, Optional[List[str]]]:
+        """Tables with a version in ``change_counter`` and the updated columns that bump it."""
+        tables: Dict[str, Optional[List[str]]] = {}
+        watched = [cache.counted_tables for cache in self.caches]
+        watched += [{queue.table: None} for queue in self.queues]
+        for counted in watched:
+            for table, columns in counted.items():
+                if columns is None or (table in tables and tables[table] is None):
+                    tables[table] = None
+                else:
+                    merged = tables.get(table) or []
+                    tables[table] = merged + [c for c in columns if c not in merged]
+        return tables
+
+    @property
+    def derived_columns(self) -> Dict[str, List[str]]:
+        """Columns maintained by projections, per table."""
+        derived: Dict[str, List[str]] = {}
+        for projection in self.projections:
+            for table, columns in projection.derived_columns.items():
+                derived.setdefault(table, []).extend(columns)
+        return derived
+
+    @property
+    def money_columns(self) -> Dict[str, List[str]]:
+        """``*_cents`` columns per table."""
+        columns: Dict[str, List[str]] = {}
+        for entity in self.entities:
+            names = [attr.name for attr in entity.attributes if attr.name.endswith(MONEY_SUFFIX)]
+            if names:
+                columns[entity.table] = names
+        return columns
+
+    @property
+    def python_target(self) -> Dict:
+        return self.targets.get("python", {}) or {}
+
+    @property
+    def append_only_sync(self) -> Dict[str, str]:
+        """Movement tables of ledgers with a ``sync_key``, mapped to that key."""
+        return {
+            p.movements_table: p.sync_key
+            for p in self.projections
+            if p.kind == "ledger" and p.sync_key is not None
+        }
+
+    @property
+    def sync_entities(self) -> List[EntityDefinition]:
+        """Entities carrying every ``metadata.sync_fields`` column, plus append-only ones."""
+        sync_fields = set(self.metadata.get("sync_fields", []))
+        if not {SYNC_DIRTY_FIELD, SYNC_TIMESTAMP_FIELD} <= sync_fields:
+            return []
+        append_only = self.append_only_sync
+        return [
+            entity
+            for entity in self.entities
+            if entity.table in append_only or sync_fields <= {attr.name for attr in entity.attributes}
+        ]
+
+
+_SOURCE_DIGEST: Optional[str] = None
+
+
+def _source_digest() -> str:
+    global _SOURCE_DIGEST
+    if _SOURCE_DIGEST is None:
+        _SOURCE_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _SOURCE_DIGEST
 
 
 class DomainLoader:
-    """Load domain YAML into rich definitions."""
+    """Load domain YAML into rich definitions.
 
-    def __init__(self, domain_path: Path):
-        self.domain_path = domain_path
+    YAML is parsed with libyaml when available. With ``cache_dir`` the resolved
+    domain is pickled there, keyed on the YAML bytes, the generator version and
+    this module's source, so unchanged schemas skip parsing and resolution.
+    """
 
-    def load(self) -> DomainDefinition:
-        data = yaml.safe_load(self.domain_path.read_text())
+    def __init__(self, domain_path: Path, cache_dir: Optional[Path] = None):
+        self.domain_path = domain_path
+        self.cache_dir = cache_dir
+
+    def load(self, timings: Optional[Timings] = None) -> DomainDefinition:
+        with phase(timings, "read"):
+            source = self.domain_path.read_bytes()
+        if self.cache_dir is None:
+            return self._resolve(source, timings)
+
+        with phase(timings, "cache"):
+            key = hashlib.sha256(
+                source + GENERATOR_VERSION.encode() + _source_digest().encode()
+            ).hexdigest()
+            path_digest = hashlib.sha256(str(self.domain_path.resolve()).encode()).hexdigest()
+            cache_path = self.cache_dir / "domain" / f"{path_digest[:16]}.pickle"
+            try:
+                cached_key, domain = pickle.loads(cache_path.read_bytes())
+                if cached_key == key:
+                    return domain
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+                # Missing, truncated or pickled against classes that have since moved.
+                pass
+
+        domain = self._resolve(source, timings)
+        with phase(timings, "cache"):
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(pickle.dumps((key, domain), protocol=pickle.HIGHEST_PROTOCOL))
+            tmp_path.replace(cache_path)
+        return domain
+
+    def _resolve(self, source: bytes, timings: Optional[Timings] = None) -> DomainDefinition:
+        with phase(timings, "parse"):
+            data = yaml.load(source, Loader=YamlLoader)
+        with phase(timings, "resolve"):
+            return self._build_domain(data)
+
+    def _build_domain(self, data: Dict) -> DomainDefinition:
         if len(data) == 1 and "entities" not in next(iter(data.values())):
             domain_name, domain_data = next(iter(data.items()))
         elif len(data) == 1:
@@ -125,10 +509,361 @@ class DomainLoader:
             for name, details in raw_entities.items()
         ]
 
+        metadata = domain_data.get("metadata", {}) or {}
+        sync_fields = metadata.get("sync_fields", [])
+        for entity in entities:
+            entity.indexes = entity.indexes + self._derived_indexes(entity, sync_fields)
+        if metadata.get("money_unit") == "cents":
+            self._check_money_columns(entities)
+
+        projections = [
+            self._build_projection(name, details, entities)
+            for name, details in (domain_data.get("projections", {}) or {}).items()
+        ]
+        version = domain_data.get("version")
         return DomainDefinition(
-            name=domain_name, enums=enums, entities=entities, custom_types=custom_types
+            name=domain_name,
+            version=None if version is None else str(version),
+            enums=enums,
+            entities=entities,
+            custom_types=custom_types,
+            metadata=metadata,
+            targets=domain_data.get("targets", {}) or {},
+            events=[
+                self._build_event(name, details, custom_types)
+                for name, details in (domain_data.get("events", {}) or {}).items()
+            ],
+            projections=projections,
+            caches=[
+                self._build_cache(name, details, entities)
+                for name, details in (domain_data.get("caches", {}) or {}).items()
+            ],
+            queues=[
+                self._build_queue(name, details, entities)
+                for name, details in (domain_data.get("queues", {}) or {}).items()
+            ],
+            reports=[
+                self._build_report(name, details, entities, projections)
+                for name, details in (domain_data.get("reports", {}) or {}).items()
+            ],
         )
 
+    def _check_money_columns(self, entities: List[EntityDefinition]) -> None:
+        """With ``money_unit: cents`` every ``*_cents`` column must be an integer."""
+        for entity in entities:
+            for attr in entity.attributes:
+                if attr.name.endswith(MONEY_SUFFIX) and attr.base_type != "int":
+                    raise ValueError(
+                        f"{entity.name}.{attr.name}: money is stored in integer cents,"
+                        f" not {attr.base_type}"
+                    )
+
+    def _build_queue(
+        self, name: str, details: Dict, entities: List[EntityDefinition]
+    ) -> QueueDefinition:
+        """Resolve a queue; ``flow`` defaults to the status enum's declared order."""
+        label = f"Queue {name}"
+        entity = next((e for e in entities if e.name == details.get("entity")), None)
+        if entity is None:
+            raise ValueError(f"Queue {name}: unknown or missing entity {details.get('entity')!r}")
+        status = _require_column(label, entity, details.get("status", "status"))
+        order_by = _require_column(label, entity, details.get("order_by", "created_at"))
+        flow = list(details.get("flow") or status.enum_values or [])
+        unknown = set(flow) - set(status.enum_values or flow)
+        if len(flow) < 2 or unknown:
+            raise ValueError(f"Queue {name}: flow needs two or more {status.enum} values")
+        return QueueDefinition(
+            name=name,
+            entity=entity.name,
+            table=entity.table,
+            key=_single_key(label, entity),
+            status=status.name,
+            order_by=order_by.name,
+            flow=flow,
+        )
+
+    def _build_cache(
+        self, name: str, details: Dict, entities: List[EntityDefinition]
+    ) -> RecipeCacheDefinition:
+        """Resolve a ``kind: recipe`` cache over a parent/component link table."""
+        label = f"Cache {name}"
+        if details.get("kind", "recipe") != "recipe":
+            raise ValueError(f"Cache {name}: unsupported kind {details.get('kind')!r}")
+        by_name = {entity.name: entity for entity in entities}
+        try:
+            recipes, parent, component = (
+                by_name[details[role]] for role in ("recipes", "parent", "component")
+            )
+        except KeyError as exc:
+            raise ValueError(f"Cache {name}: unknown or missing entity {exc}") from None
+        cost = details.get("cost")
+        if cost is not None:
+            _require_column(label, component, cost)
+        return RecipeCacheDefinition(
+            name=name,
+            class_name="".join(part.title() for part in name.split("_")) + "Cache",
+            recipes_table=recipes.table,
+            parent_fk=_relation_column(label, recipes, parent),
+            component_fk=_relation_column(label, recipes, component),
+            quantity=_require_column(label, recipes, details.get("quantity", "quantity")).name,
+            component_table=component.table,
+            component_key=_single_key(label, component),
+            cost=cost,
+        )
+
+    def _build_report(
+        self,
+        name: str,
+        details: Dict,
+        entities: List[EntityDefinition],
+        projections: List[Projection],
+    ) -> ReportDefinition:
+        """Resolve a ``kind: sales`` report over its totals (and ledger) projections."""
+        label = f"Report {name}"
+        if details.get("kind", "sales") != "sales":
+            raise ValueError(f"Report {name}: unsupported kind {details.get('kind')!r}")
+        by_table = {entity.table: entity for entity in entities}
+        named = {projection.name: projection for projection in projections}
+
+        def projection(role: str, spec: Dict, kind: str) -> Projection:
+            found = named.get(spec.get(role))
+            if found is None or found.kind != kind:
+                raise ValueError(f"Report {name}: {role} must name a {kind} projection")
+            return found
+
+        sales = projection("sales", details, "totals")
+        orders, lines = by_table[sales.through_table], by_table[sales.lines_table]
+        report = ReportDefinition(
+            name=name,
+            orders_table=orders.table,
+            orders_key=sales.through_key,
+            order_at=_require_column(label, orders, details.get("at", "created_at")).name,
+            order_status=sales.status,
+            excluded_statuses=sales.excluded_statuses,
+            lines_table=lines.table,
+            line_fk=sales.line_fk,
+            item_fk=_require_column(label, lines, details.get("item", "item_id")).name,
+            quantity=sales.columns["quantity"],
+            line_total=sales.columns["line_total"],
+        )
+        watched = [orders, lines]
+
+        payments = details.get("payments")
+        if payments:
+            entity = next((e for e in entities if e.name == payments.get("entity")), None)
+            if entity is None:
+                raise ValueError(
+                    f"Report {name}: unknown or missing entity {payments.get('entity')!r}"
+                )
+            report.payments_table = entity.table
+            report.payment_method = _require_column(label, entity, payments.get("method", "method")).name
+            report.payment_amount = _require_column(
+                label, entity, payments.get("amount", "amount_cents")
+            ).name
+            report.payment_at = _require_column(label, entity, payments.get("at", "received_at")).name
+            watched.append(entity)
+
+        waste = details.get("waste")
+        if waste:
+            ledger = projection("ledger", waste, "ledger")
+            if ledger.created_field is None:
+                raise ValueError(f"Report {name}: {ledger.movements_table} has no created_at column")
+            types = list(waste.get("movement_types") or ["adjustment"])
+            unknown = [value for value in types if value not in ledger.signs]
+            if unknown:
+                raise ValueError(f"Report {name}: no sign for movement type {unknown[0]!r}")
+            report.movements_table = ledger.movements_table
+            report.movement_fk = ledger.movement_fk
+            report.movement_quantity = ledger.quantity
+            report.movement_type = ledger.type_field
+            report.movement_at = ledger.created_field
+            report.waste_signs = {value: ledger.signs[value] for value in types}
+            watched.append(by_table[ledger.movements_table])
+
+        # Ledger movements are append-only and numbered locally as they arrive,
+        # so their key is a safe watermark even when they carry a timestamp.
+        append_only = {p.movements_table for p in projections if p.kind == "ledger"}
+        report.watermarks = {
+            entity.table: SYNC_TIMESTAMP_FIELD
+            if entity.table not in append_only
+            and any(attr.name == SYNC_TIMESTAMP_FIELD for attr in entity.attributes)
+            else _single_key(label, entity)
+            for entity in watched
+        }
+        return report
+
+    def _build_projection(
+        self, name: str, details: Dict, entities: List[EntityDefinition]
+    ) -> Projection:
+        """Resolve a projection and the foreign keys it follows."""
+        builders = {"totals": self._build_totals, "ledger": self._build_ledger}
+        kind = details.get("kind", "totals")
+        if kind not in builders:
+            raise ValueError(f"Projection {name}: unsupported kind {kind!r}")
+        by_name = {entity.name: entity for entity in entities}
+
+        def entity(role: str, spec: Dict = details) -> EntityDefinition:
+            try:
+                return by_name[spec[role]]
+            except KeyError as exc:
+                raise ValueError(f"Projection {name}: unknown or missing entity {exc}") from None
+
+        return builders[kind](name, details, entity)
+
+    def _build_totals(
+        self, name: str, details: Dict, entity: Callable[..., EntityDefinition]
+    ) -> TotalsProjection:
+        label = f"Projection {name}"
+        target, through, lines = entity("target"), entity("through"), entity("lines")
+        status_attr = next(
+            (attr for attr in through.attributes if attr.name == details.get("status", "status")),
+            None,
+        )
+        columns = {**TOTALS_COLUMNS, **(details.get("columns", {}) or {})}
+        for role, column in columns.items():
+            _require_column(label, target if role in ("subtotal", "total") else lines, column)
+        return TotalsProjection(
+            name=name,
+            target_table=target.table,
+            target_key=_single_key(label, target),
+            through_table=through.table,
+            through_key=_single_key(label, through),
+            target_fk=_relation_column(label, through, target),
+            lines_table=lines.table,
+            lines_key=_single_key(label, lines),
+            line_fk=_relation_column(label, lines, through),
+            status=status_attr.name if status_attr else None,
+            excluded_statuses=list(details.get("exclude_status", []) or []),
+            columns=columns,
+        )
+
+    def _build_ledger(
+        self, name: str, details: Dict, entity: Callable[..., EntityDefinition]
+    ) -> LedgerProjection:
+        label = f"Projection {name}"
+        target, movements = entity("target"), entity("movements")
+        balance = _require_column(label, target, details.get("balance", "balance"))
+        quantity = _require_column(label, movements, details.get("quantity", "quantity")).name
+        type_field = _require_column(label, movements, details.get("type_field", "movement_type"))
+        signs = details.get("signs") or {value: 1 for value in type_field.enum_values or []}
+        created = details.get("created_field", "created_at")
+        sync_key = details.get("sync_key")
+        if sync_key is not None:
+            _require_column(label, movements, sync_key)
+            _require_column(label, movements, SYNC_DIRTY_FIELD)
+
+        consume = None
+        spec = details.get("consume")
+        if spec:
+            recipes, lines = entity("recipes", spec), entity("lines", spec)
+            recipe_item = next(
+                (
+                    attr
+                    for attr in recipes.attributes
+                    if attr.relation and attr.relation[0] != target.table
+                ),
+                None,
+            )
+            line_item = next(
+                (
+                    attr
+                    for attr in lines.attributes
+                    if recipe_item and attr.relation == recipe_item.relation
+                ),
+                None,
+            )
+            if line_item is None:
+                raise ValueError(
+                    f"Projection {name}: {recipes.name} and {lines.name} share no relation"
+                )
+            movement_type = spec.get("movement_type", "out")
+            if movement_type not in signs:
+                raise ValueError(f"Projection {name}: no sign for movement type {movement_type!r}")
+            consume = LedgerConsumption(
+                function_name=spec.get("function", f"consume_for_{lines.table}s"),
+                recipes_table=recipes.table,
+                recipe_target_fk=_relation_column(label, recipes, target),
+                recipe_item_fk=recipe_item.name,
+                recipe_quantity=_require_column(label, recipes, spec.get("quantity", "quantity")).name,
+                lines_table=lines.table,
+                lines_key=_single_key(label, lines),
+                line_item_fk=line_item.name,
+                line_quantity=_require_column(label, lines, spec.get("line_quantity", "quantity")).name,
+                movement_line_fk=_relation_column(label, movements, lines),
+                movement_type=movement_type,
+                reason=spec.get("reason"),
+            )
+
+        return LedgerProjection(
+            name=name,
+            target_table=target.table,
+            target_key=_single_key(label, target),
+            balance=balance.name,
+            balance_type=balance.sqlite_type,
+            movements_table=movements.table,
+            movements_key=_single_key(label, movements),
+            movement_fk=_relation_column(label, movements, target),
+            quantity=quantity,
+            type_field=type_field.name,
+            signs={str(key): int(value) for key, value in signs.items()},
+            created_field=created if created in {a.name for a in movements.attributes} else None,
+            consume=consume,
+            sync_key=sync_key,
+        )
+
+    def _build_event(self, name: str, details: Dict, custom_types: Dict) -> EventDefinition:
+        """Resolve an event payload; the aggregate id defaults to ``<aggregate>_id``."""
+        aggregate = details["aggregate"]
+        fields = []
+        for field_name, attr in (details.get("payload", {}) or {}).items():
+            base_type = self._resolve_base_type(attr, custom_types)
+            nullable = attr.get("nullable", not attr.get("required", False))
+            fields.append(
+                EventFieldDefinition(
+                    name=field_name,
+                    python_name=f"{field_name}_" if keyword.iskeyword(field_name) else field_name,
+                    base_type=base_type,
+                    python_type=self._python_type(base_type),
+                    nullable=nullable is not False,
+                )
+            )
+        names = {event_field.name: event_field.python_name for event_field in fields}
+        aggregate_field = details.get("aggregate_id")
+        if aggregate_field is None:
+            aggregate_field = re.sub(r"(?<!^)(?=[A-Z])", "_", aggregate).lower() + "_id"
+        return EventDefinition(
+            name=name,
+            aggregate=aggregate,
+            fields=fields,
+            aggregate_field=names.get(aggregate_field),
+        )
+
+    def _derived_indexes(self, entity: EntityDefinition, sync_fields: List[str]) -> List[Dict]:
+        """Indexes for relation columns (unless ``index: false``) and sync scans.
+
+        Columns already leading the primary key or an explicit index are skipped.
+        """
+        pk_columns = [attr.name for attr in entity.attributes if attr.primary_key]
+        covered = {idx["columns"][0] for idx in entity.indexes if idx.get("columns")}
+        if pk_columns:
+            covered.add(pk_columns[0])
+
+        derived: List[Dict] = []
+        for attr in entity.attributes:
+            wanted = attr.index if attr.index is not None else attr.relation is not None
+            if not wanted or attr.name in covered:
+                continue
+            derived.append({"name": f"idx_{entity.table}_{attr.name}", "columns": [attr.name]})
+            covered.add(attr.name)
+
+        sync_columns = [SYNC_DIRTY_FIELD, SYNC_TIMESTAMP_FIELD]
+        names = {attr.name for attr in entity.attributes}
+        if set(sync_columns) <= set(sync_fields) & names and not any(
+            idx.get("columns", [])[:2] == sync_columns for idx in entity.indexes
+        ):
+            derived.append({"name": f"idx_{entity.table}_sync", "columns": sync_columns})
+        return derived
+
     def _resolve_base_type(self, attr: Dict, custom_types: Dict) -> str:
         attr_type = attr.get("type", "string")
         if attr_type == "enum":
@@ -166,6 +901,8 @@ class DomainLoader:
             custom_types,
             enums,
         )
+        resolved.index = attr.get("index")
+        resolved.renamed_from = attr.get("renamed_from")
         resolved.relation = (
             target_entity.get("storage", {}).get("table", target),
             target_field,
@@ -211,6 +948,8 @@ class DomainLoader:
             enum_values=enum_values,
             precision=precision,
             scale=scale,
+            index=attr.get("index"),
+            renamed_from=attr.get("renamed_from"),
         )
 
     def _build_entity(
@@ -238,6 +977,7 @@ class DomainLoader:
             attributes=attrs,
             indexes=details.get("indexes", []),
             methods=details.get("methods", []),
+            renamed_from=details.get("storage", {}).get("renamed_from"),
         )
 
     def _python_type(self, base_type: str) -> str:
@@ -265,10 +1005,132 @@ class DomainLoader:
         return repr(default)
 
 
+def _python_literal(value: object) -> str:
+    """Python source for a YAML scalar, with double-quoted strings."""
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return repr(value)
+
+
+def _python_tuple(items: Iterable[object]) -> str:
+    """Python source for a tuple literal, nesting lists and tuples."""
+    parts = [
+        _python_tuple(item) if isinstance(item, (list, tuple)) else _python_literal(item)
+        for item in items
+    ]
+    if len(parts) == 1:
+        return f"({parts[0]},)"
+    return f"({', '.join(parts)})"
+
+
+def _single_key(label: str, entity: EntityDefinition) -> str:
+    """The key column of ``entity``; errors are prefixed with ``label`` (e.g. "Cache recipes")."""
+    keys = [attr.name for attr in entity.attributes if attr.primary_key]
+    if len(keys) != 1:
+        raise ValueError(f"{label}: {entity.name} needs a single-column key")
+    return keys[0]
+
+
+def _relation_column(label: str, entity: EntityDefinition, referenced: EntityDefinition) -> str:
+    for attr in entity.attributes:
+        if attr.relation == (referenced.table, _single_key(label, referenced)):
+            return attr.name
+    raise ValueError(f"{label}: {entity.name} has no relation to {referenced.name}")
+
+
+def _require_column(label: str, entity: EntityDefinition, name: str) -> AttributeDefinition:
+    for attr in entity.attributes:
+        if attr.name == name:
+            return attr
+    raise ValueError(f"{label}: {entity.name} has no column {name!r}")
+
+
+def _ledger_delta_sql(projection: LedgerProjection, alias: str) -> str:
+    """SQL for the signed balance change of one movement row."""
+    cases = " ".join(
+        f"WHEN '{value}' THEN {sign}" for value, sign in projection.signs.items()
+    )
+    return (
+        f'(CASE {alias}."{projection.type_field}" {cases} ELSE 0 END)'
+        f' * {alias}."{projection.quantity}"'
+    )
+
+
+def _line_total_sql(projection: TotalsProjection, alias: str) -> str:
+    """SQL for one line's total in cents: discount, then tax, rounded half up.
+
+    Percentages become integer basis points so the arithmetic stays in
+    64-bit integers and matches ``line_total_cents`` in the generated module.
+    """
+    columns = projection.columns
+
+    def basis_points(role: str) -> str:
+        return f'CAST(ROUND(COALESCE({alias}."{columns[role]}", 0) * 100) AS INTEGER)'
+
+    gross = f'{alias}."{columns["quantity"]}" * {alias}."{columns["unit_price"]}"'
+    return (
+        f"({gross} * (10000 - {basis_points('discount_percent')})"
+        f" * (10000 + {basis_points('tax_percent')}) + 50000000) / 100000000"
+    )
+
+
 def _python_type_hint(attr: AttributeDefinition) -> str:
     return f"Optional[{attr.python_type}]" if attr.nullable else attr.python_type
 
 
+DART_RESERVED = {
+    "assert", "break", "case", "catch", "class", "const", "continue", "default", "do",
+    "else", "enum", "extends", "false", "final", "finally", "for", "if", "in", "is",
+    "new", "null", "rethrow", "return", "super", "switch", "this", "throw", "true",
+    "try", "var", "void", "while", "with",
+}
+
+
+def _dart_identifier(name: str) -> str:
+    """lowerCamelCase Dart name for a column or enum value."""
+    head, *rest = name.replace("-", "_").split("_")
+    identifier = head + "".join(part[:1].upper() + part[1:] for part in rest)
+    return identifier + "_" if identifier in DART_RESERVED else identifier
+
+
+def _dart_type(attr: AttributeDefinition) -> str:
+    dart = attr.enum or BASE_TYPES.get(attr.base_type, BASE_TYPES["string"])["dart"]
+    return f"{dart}?" if attr.nullable else dart
+
+
+def _dart_from_map(attr: AttributeDefinition) -> str:
+    """Dart expression reading ``attr`` from a sqflite row map."""
+    raw = f"map['{attr.name}']"
+    dart = _dart_type(attr).rstrip("?")
+    if attr.enum:
+        value = f"{dart}.fromValue({raw} as String)"
+    elif dart == "DateTime":
+        value = f"DateTime.parse({raw} as String)"
+    elif dart == "bool":
+        value = f"({raw} as int) != 0"
+    elif dart == "double":
+        value = f"({raw} as num).toDouble()"
+    else:
+        return f"{raw} as {_dart_type(attr)}"
+    return f"{raw} == null ? null : {value}" if attr.nullable else value
+
+
+def _dart_to_map(attr: AttributeDefinition) -> str:
+    """Dart expression writing ``attr`` back to a sqflite row map."""
+    field_name = _dart_identifier(attr.name)
+    dart = _dart_type(attr).rstrip("?")
+    access = f"{field_name}?." if attr.nullable else f"{field_name}."
+    if attr.enum:
+        return access + "value"
+    if dart == "DateTime":
+        return access + "toIso8601String()"
+    if dart == "bool":
+        if attr.nullable:
+            return f"{field_name} == null ? null : ({field_name}! ? 1 : 0)"
+        return f"{field_name} ? 1 : 0"
+    return field_name
+
+
 def render_python_model_content(entity: EntityDefinition) -> str:
     lines = [
         f'"""SQLAlchemy model for {entity.name}."""',
@@ -304,7 +1166,9 @@ def render_python_model_content(entity: EntityDefinition) -> str:
 
     for attr in entity.attributes:
         column_type = (
-            f"SAEnum(enums.{attr.enum})" if attr.enum else attr.sqlalchemy_type
+            f"SAEnum(enums.{attr.enum}, values_callable=enums.enum_values)"
+            if attr.enum
+            else attr.sqlalchemy_type
         )
         column_parts = [column_type]
         if attr.relation:
@@ -339,6 +1203,13 @@ def render_enums_content(enums: Dict[str, EnumDefinition]) -> str:
         "from __future__ import annotations",
         "",
         "from enum import Enum",
+        "from typing import List, Type",
+        "",
+        "",
+        "def enum_values(enum_cls: Type[Enum]) -> List[str]:",
+        '    """Persist members by value, matching the CHECK constraints in the DDL."""',
+        "    return [member.value for member in enum_cls]",
+        "",
         "",
     ]
     for enum in enums.values():
@@ -348,6 +1219,7 @@ def render_enums_content(enums: Dict[str, EnumDefinition]) -> str:
         lines.append("")
         lines.append("")
     lines.append("__all__ = [")
+    lines.append('    "enum_values",')
     for enum in enums.values():
         lines.append(f'    "{enum.name}",')
     lines.append("]")
@@ -360,7 +1232,11 @@ def render_base_content() -> str:
         '"""SQLAlchemy declarative base for generated models."""\n'
         "from __future__ import annotations\n\n"
         "from sqlalchemy.orm import declarative_base\n\n"
-        "Base = declarative_base()\n"
+        "try:  # ``obj.awaitable_attrs`` for the async target; needs greenlet\n"
+        "    from sqlalchemy.ext.asyncio import AsyncAttrs\n"
+        "except ImportError:\n"
+        "    AsyncAttrs = object\n\n"
+        "Base = declarative_base(cls=AsyncAttrs)\n"
     )
 
 
@@ -385,6 +1261,89 @@ def render_init_content(entities: List[EntityDefinition]) -> str:
     return "\n".join(lines)
 
 
+def sqlite_column_def(attr: AttributeDefinition, single_primary_key: bool = True) -> str:
+    """Column definition as it appears in the generated ``CREATE TABLE``."""
+    col_name = f'"{attr.name}"'
+    col = f"{col_name} {attr.sqlite_type}"
+    if attr.enum_values:
+        allowed = ", ".join([f"'{v}'" for v in attr.enum_values])
+        col += f" CHECK ({col_name} IN ({allowed}))"
+    if attr.primary_key and attr.autoincrement and single_primary_key:
+        col = f"{col_name} INTEGER PRIMARY KEY AUTOINCREMENT"
+    elif attr.primary_key and single_primary_key:
+        col += " NOT NULL PRIMARY KEY"
+    elif attr.primary_key:
+        col += " NOT NULL"
+    if not attr.primary_key and not attr.nullable:
+        col += " NOT NULL"
+    default_literal = sqlite_default_literal(attr)
+    if default_literal is not None:
+        col += f" DEFAULT {default_literal}"
+    return col
+
+
+def sqlite_default_literal(attr: AttributeDefinition) -> Optional[str]:
+    default_val = attr.raw.get("default")
+    if default_val is None:
+        return None
+    if isinstance(default_val, str):
+        return f"'{default_val}'"
+    if isinstance(default_val, bool):
+        return "1" if default_val else "0"
+    return str(default_val)
+
+
+def sqlite_index_name(table: str, idx: Dict, position: int) -> str:
+    return idx.get("name") or f"idx_{table}_{position}"
+
+
+def sqlite_index_sql(table: str, idx: Dict, position: int) -> str:
+    unique = "UNIQUE " if idx.get("unique") else ""
+    cols = ",".join([f'"{c}"' for c in idx["columns"]])
+    name = sqlite_index_name(table, idx, position)
+    return f'CREATE {unique}INDEX IF NOT EXISTS {name} ON "{table}" ({cols});'
+
+
+def dependency_order(entities: List[EntityDefinition]) -> List[EntityDefinition]:
+    """Entities sorted so every relation target comes before the tables using it.
+
+    Ties keep declaration order; self-references are allowed. Raises
+    ``ValueError`` naming the tables of a foreign-key cycle.
+    """
+    by_table = {entity.table: entity for entity in entities}
+    depends = {
+        entity.table: {
+            attr.relation[0]
+            for attr in entity.attributes
+            if attr.relation and attr.relation[0] != entity.table and attr.relation[0] in by_table
+        }
+        for entity in entities
+    }
+    ordered: List[EntityDefinition] = []
+    placed: set = set()
+    remaining = [entity.table for entity in entities]
+    while remaining:
+        ready = [table for table in remaining if depends[table] <= placed]
+        if not ready:
+            raise ValueError(f"Foreign-key cycle between tables: {_find_cycle(depends, remaining)}")
+        for table in ready:
+            ordered.append(by_table[table])
+            placed.add(table)
+        remaining = [table for table in remaining if table not in placed]
+    return ordered
+
+
+def _find_cycle(depends: Dict[str, set], tables: List[str]) -> str:
+    # Every table left has an unplaced dependency, so following them must loop.
+    unplaced = set(tables)
+    path: List[str] = []
+    table = tables[0]
+    while table not in path:
+        path.append(table)
+        table = min(depends[table] & unplaced)
+    return " -> ".join(path[path.index(table):] + [table])
+
+
 def render_sql_content(entity: EntityDefinition) -> str:
     pk_columns = [attr.name for attr in entity.attributes if attr.primary_key]
     quoted_table = f'"{entity.table}"'
@@ -392,29 +1351,9 @@ def render_sql_content(entity: EntityDefinition) -> str:
         f"-- Auto-generated SQLite DDL for {entity.table}",
         f"CREATE TABLE IF NOT EXISTS {quoted_table} (",
     ]
-    column_defs: List[str] = []
-    for attr in entity.attributes:
-        col_name = f'"{attr.name}"'
-        col = f"{col_name} {attr.sqlite_type}"
-        if attr.enum_values:
-            allowed = ", ".join([f"'{v}'" for v in attr.enum_values])
-            col += f" CHECK ({col_name} IN ({allowed}))"
-        if attr.primary_key and attr.autoincrement and len(pk_columns) == 1:
-            col = f"{col_name} INTEGER PRIMARY KEY AUTOINCREMENT"
-        elif attr.primary_key:
-            col += " NOT NULL"
-        if not attr.primary_key and not attr.nullable:
-            col += " NOT NULL"
-        if attr.raw.get("default") is not None:
-            default_val = attr.raw.get("default")
-            if isinstance(default_val, str):
-                default_literal = f"'{default_val}'"
-            elif isinstance(default_val, bool):
-                default_literal = "1" if default_val else "0"
-            else:
-                default_literal = str(default_val)
-            col += f" DEFAULT {default_literal}"
-        column_defs.append(col)
+    column_defs = [
+        sqlite_column_def(attr, len(pk_columns) == 1) for attr in entity.attributes
+    ]
 
     lines.append("  " + ",\n  ".join(column_defs))
     if len(pk_columns) > 1:
@@ -430,99 +1369,1237 @@ def render_sql_content(entity: EntityDefinition) -> str:
     lines.append(");")
 
     for idx_num, idx in enumerate(entity.indexes, start=1):
-        unique = "UNIQUE " if idx.get("unique") else ""
-        cols = ",".join([f'"{c}"' for c in idx["columns"]])
-        lines.append(
-            f"CREATE {unique}INDEX IF NOT EXISTS idx_{entity.table}_{idx_num} ON {quoted_table} ({cols});"
-        )
+        lines.append(sqlite_index_sql(entity.table, idx, idx_num))
 
     return "\n".join(lines) + "\n"
 
 
+_ENVIRONMENTS: Dict[Tuple[Path, Optional[Path]], "Environment"] = {}
+
+
+def get_environment(
+    templates_path: Path, cache_dir: Optional[Path] = None
+) -> Optional["Environment"]:
+    """Return the process-wide Jinja environment for ``templates_path``.
+
+    Compiled templates stay in the environment's memory cache, and with
+    ``cache_dir`` their bytecode is also persisted on disk (Jinja keys each
+    entry on the template name and checks it against the source hash), so
+    later processes skip compilation entirely.
+    """
+    if Environment is None:
+        return None
+    key = (templates_path, cache_dir)
+    env = _ENVIRONMENTS.get(key)
+    if env is None:
+        bytecode_cache = None
+        if cache_dir is not None:
+            jinja_dir = cache_dir / "jinja"
+            jinja_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(jinja_dir))
+        env = Environment(
+            loader=FileSystemLoader(str(templates_path)),
+            autoescape=select_autoescape(disabled_extensions=(".j2",)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            bytecode_cache=bytecode_cache,
+        )
+        _ENVIRONMENTS[key] = env
+    return env
+
+
 class Generator:
     """Render Python models and SQLite DDL using templates."""
 
-    def __init__(self, templates_path: Path):
-        if Environment is not None:
-            self.env = Environment(
-                loader=FileSystemLoader(str(templates_path)),
-                autoescape=select_autoescape(disabled_extensions=(".j2",)),
-                trim_blocks=True,
-                lstrip_blocks=True,
-            )
-        else:
-            self.env = None
+    def __init__(self, templates_path: Path, cache_dir: Optional[Path] = None):
+        self.templates_path = templates_path
+        self.cache_dir = cache_dir
+        self.env = get_environment(templates_path, cache_dir)
+        # template name -> [calls, seconds, load seconds], reset by each render unit
+        self.template_times: Dict[str, List[float]] = {}
+        # key -> (value, digest) of the last value digested under that key
+        self._digests: Dict[str, Tuple[Any, str]] = {}
+
+    def digest(self, key: str, value: Any) -> str:
+        """``content_digest(value)``, reused while ``value`` equals the last one under ``key``.
+
+        Comparing resolved definitions is much cheaper than serialising them,
+        so a long-lived generator (``--watch``) only re-digests what changed.
+        Values must not be mutated once digested.
+        """
+        cached = self._digests.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        digest = content_digest(value)
+        self._digests[key] = (value, digest)
+        return digest
+
+    def template_digest(self, *names: str) -> str:
+        """Digest of the template sources, or of the builtin renderers without Jinja."""
+        if not self.env:
+            return content_digest("builtin", GENERATOR_VERSION)
+        return content_digest(
+            *[(self.templates_path / name).read_text() for name in names]
+        )
 
     def render_python(self, entity: EntityDefinition, enums: Dict[str, EnumDefinition]) -> str:
         if self.env:
-            template = self.env.get_template("python_model.j2")
-            return template.render(entity=entity, enums=enums)
+            return self._render("python_model.j2", entity=entity, enums=enums)
         return render_python_model_content(entity)
 
     def render_sql(self, entity: EntityDefinition) -> str:
         if self.env:
-            template = self.env.get_template("sqlite_table.j2")
-            return template.render(entity=entity)
+            return self._render("sqlite_table.j2", entity=entity)
         return render_sql_content(entity)
 
     def render_enums(self, enums: Dict[str, EnumDefinition]) -> str:
         if self.env:
-            template = self.env.get_template("python_enums.j2")
-            return template.render(enums=enums)
+            return self._render("python_enums.j2", enums=enums)
         return render_enums_content(enums)
 
     def render_init(self, entities: List[EntityDefinition]) -> str:
         if self.env:
-            template = self.env.get_template("python_init.j2")
-            return template.render(entities=entities)
+            return self._render("python_init.j2", entities=entities)
         return render_init_content(entities)
 
     def render_base(self) -> str:
         if self.env:
-            template = self.env.get_template("python_base.j2")
-            return template.render()
+            return self._render("python_base.j2")
         return render_base_content()
 
+    def render_template(self, name: str, **context) -> str:
+        """Render a template that has no builtin fallback renderer."""
+        if not self.env:
+            raise RuntimeError(f"Jinja2 is required to render {name}")
+        return self._render(name, **context)
+
+    def _render(self, name: str, **context) -> str:
+        start = time.perf_counter()
+        template = self.env.get_template(name)
+        loaded = time.perf_counter()
+        content = template.render(**context)
+        stats = self.template_times.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += time.perf_counter() - start
+        stats[2] += loaded - start
+        return content
+
+    def render_repository(self, entity: EntityDefinition) -> str:
+        primary_key = [attr.name for attr in entity.attributes if attr.primary_key]
+        unique_keys = [idx["columns"] for idx in entity.indexes if idx.get("unique")]
+        return self.render_template(
+            "python_repository.j2",
+            entity=entity,
+            primary_key=_python_tuple(primary_key),
+            unique_keys=_python_tuple(unique_keys),
+        )
+
+    def render_database(self, python_target: Dict) -> str:
+        sqlite_config = python_target.get("sqlite", {}) or {}
+        pragmas = {**DEFAULT_SQLITE_PRAGMAS, **(sqlite_config.get("pragmas", {}) or {})}
+        return self.render_template(
+            "python_database.j2",
+            url=_python_literal(sqlite_config.get("url", DEFAULT_DATABASE_URL)),
+            pragmas=[
+                (_python_literal(name), _python_literal(value))
+                for name, value in pragmas.items()
+            ],
+        )
+
+
+@dataclass
+class RenderUnit:
+    """Group of output files rendered together from inputs hashed into ``digest``."""
+
+    key: str
+    digest: str
+    render: Callable[["Generator"], Dict[str, str]]
+    target: str = ""
+    # What the consolidated schema needs from this unit: ``sql`` renders only
+    # its ``sql/`` files, and ``sql_digest`` hashes just their inputs.
+    sql: Optional[Callable[["Generator"], Dict[str, str]]] = None
+    sql_digest: str = ""
+
+
+@dataclass
+class GenerationReport:
+    """Files touched by a generation run."""
+
+    written: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
 
-def write_file(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content)
 
+def write_file(path: Path, content: str) -> bool:
+    """Write ``content`` unless the file already holds the same bytes."""
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
 
-def generate(domain_path: Path, output_dir: Path) -> None:
-    loader = DomainLoader(domain_path)
-    domain = loader.load()
 
-    generator = Generator(Path(__file__).parent / "templates")
+def _render_base_files(generator: Generator) -> Dict[str, str]:
+    return {"python/base.py": generator.render_base()}
 
-    python_dir = output_dir / "python"
-    sql_dir = output_dir / "sql"
-    python_dir.mkdir(parents=True, exist_ok=True)
-    sql_dir.mkdir(parents=True, exist_ok=True)
 
-    write_file(python_dir / "base.py", generator.render_base())
-    write_file(python_dir / "enums.py", generator.render_enums(domain.enums))
+def _render_database_files(generator: Generator, python_target: Dict) -> Dict[str, str]:
+    return {"python/database.py": generator.render_database(python_target)}
 
+
+def _render_async_files(generator: Generator, python_target: Dict) -> Dict[str, str]:
+    sqlite_config = python_target.get("sqlite", {}) or {}
+    url = sqlite_config.get("async_url")
+    if url is None:
+        url = sqlite_config.get("url", DEFAULT_DATABASE_URL)
+        if url.startswith("sqlite:"):
+            url = ASYNC_SQLITE_DRIVER + url[len("sqlite"):]
+    return {
+        "python/async_database.py": generator.render_template(
+            "python_async_database.j2", url=_python_literal(url)
+        )
+    }
+
+
+def _render_repository_base_files(generator: Generator) -> Dict[str, str]:
+    return {"python/repository.py": generator.render_template("python_repository_base.j2")}
+
+
+def _render_repositories_init_files(
+    generator: Generator, entities: List[EntityDefinition]
+) -> Dict[str, str]:
+    return {
+        "python/repositories/__init__.py": generator.render_template(
+            "python_repositories_init.j2", entities=entities
+        )
+    }
+
+
+def _render_sync_files(
+    generator: Generator,
+    entities: List[EntityDefinition],
+    derived_columns: Dict[str, List[str]],
+    append_only: Dict[str, str],
+) -> Dict[str, str]:
+    return {
+        "python/sync.py": generator.render_template(
+            "python_sync.j2",
+            entities=entities,
+            append_only=append_only,
+            derived_columns={
+                table: _python_tuple(columns) for table, columns in derived_columns.items()
+            },
+            dirty_field=SYNC_DIRTY_FIELD,
+            timestamp_field=SYNC_TIMESTAMP_FIELD,
+        )
+    }
+
+
+def _render_events_sql(generator: Generator) -> Dict[str, str]:
+    return {
+        f"sql/{EVENT_TABLE}.sql": generator.render_template(
+            "sqlite_events.j2", table=EVENT_TABLE
+        ),
+        f"sql/{EVENT_TABLE}__outbox.sql": generator.render_template(
+            "sqlite_outbox.j2", table=EVENT_TABLE
+        ),
+    }
+
+
+def _render_events_files(
+    generator: Generator, events: List[EventDefinition]
+) -> Dict[str, str]:
+    return {
+        "python/events.py": generator.render_template(
+            "python_events.j2", events=events, table=EVENT_TABLE
+        ),
+        "python/outbox.py": generator.render_template("python_outbox.j2", table=EVENT_TABLE),
+        **_render_events_sql(generator),
+    }
+
+
+def _render_counter_sql(
+    generator: Generator, tables: Dict[str, Optional[List[str]]]
+) -> Dict[str, str]:
+    files = {"sql/change_counter.sql": generator.render_template("sqlite_change_counter.j2")}
+    for table, columns in tables.items():
+        files[f"sql/{table}__change_counter.sql"] = generator.render_template(
+            "sqlite_change_counter_triggers.j2", table=table, columns=columns
+        )
+    return files
+
+
+def _render_counter_files(
+    generator: Generator, tables: Dict[str, Optional[List[str]]]
+) -> Dict[str, str]:
+    return {
+        "python/counters.py": generator.render_template("python_counters.j2", tables=list(tables)),
+        **_render_counter_sql(generator, tables),
+    }
+
+
+SCHEMA_FILE = "sql/schema.sql"
+
+
+def _render_schema_files(
+    generator: Generator,
+    domain: DomainDefinition,
+    features: Tuple[Callable[[Generator], Dict[str, str]], ...],
+) -> Dict[str, str]:
+    """Tables in foreign-key order, then the ``features`` SQL, in one script."""
+    rendered: Dict[str, str] = {}
+    for render_sql in features:
+        rendered.update(render_sql(generator))
+    parts = [generator.render_sql(entity) for entity in dependency_order(domain.entities)]
+    parts += [rendered[path] for path in sorted(rendered)]
+    body = "\n".join(part.strip() + "\n" for part in parts)
+    return {
+        SCHEMA_FILE: generator.render_template(
+            "sqlite_schema.j2",
+            domain=domain,
+            body=body,
+            schema_digest=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            generator_version=GENERATOR_VERSION,
+        )
+    }
+
+
+def _render_queue_sql(
+    generator: Generator, queues: List[QueueDefinition]
+) -> Dict[str, str]:
+    return {
+        f"sql/{queue.table}__{queue.name}.sql": generator.render_template(
+            "sqlite_queue.j2", queue=queue
+        )
+        for queue in queues
+    }
+
+
+def _render_queue_files(
+    generator: Generator, queues: List[QueueDefinition]
+) -> Dict[str, str]:
+    files = {
+        f"python/{queue.name}.py": generator.render_template(
+            "python_queue.j2", queue=queue, python_tuple=_python_tuple
+        )
+        for queue in queues
+    }
+    files.update(_render_queue_sql(generator, queues))
+    return files
+
+
+def _render_cache_files(
+    generator: Generator, caches: List[RecipeCacheDefinition]
+) -> Dict[str, str]:
+    return {
+        "python/recipes.py": generator.render_template(
+            "python_recipes.j2", caches=caches, python_tuple=_python_tuple
+        )
+    }
+
+
+def _render_report_files(
+    generator: Generator, reports: List[ReportDefinition]
+) -> Dict[str, str]:
+    return {
+        f"python/{report.name}.py": generator.render_template(
+            "python_report.j2", report=report, python_tuple=_python_tuple
+        )
+        for report in reports
+    }
+
+
+def _export_kind(attr: AttributeDefinition) -> str:
+    if attr.enum:
+        return "enum"
+    if attr.base_type in ("datetime", "timestamp"):
+        return "timestamp"
+    return {"int": "int64", "float": "float64", "decimal": "float64", "bool": "bool"}.get(
+        attr.base_type, "string"
+    )
+
+
+def _render_export_files(generator: Generator, entities: List[EntityDefinition]) -> Dict[str, str]:
+    columns = {
+        entity.table: [
+            [
+                _python_literal(attr.name),
+                _python_literal(_export_kind(attr)),
+                _python_literal(attr.nullable),
+                _python_tuple(attr.enum_values or ()),
+            ]
+            for attr in entity.attributes
+        ]
+        for entity in entities
+    }
+    return {
+        "python/export.py": generator.render_template(
+            "python_export.j2", entities=entities, columns=columns
+        )
+    }
+
+
+def _render_money_files(
+    generator: Generator, money_columns: Dict[str, List[str]], columns: Dict[str, str]
+) -> Dict[str, str]:
+    return {
+        "python/money.py": generator.render_template(
+            "python_money.j2",
+            money_columns=money_columns,
+            columns=columns,
+            python_tuple=_python_tuple,
+        )
+    }
+
+
+_PROJECTION_HELPERS = {
+    "line_total_sql": _line_total_sql,
+    "ledger_delta_sql": _ledger_delta_sql,
+    "dirty_field": SYNC_DIRTY_FIELD,
+}
+
+
+def _render_projection_sql(
+    generator: Generator, projections: List[Projection]
+) -> Dict[str, str]:
+    return {
+        f"sql/{projection.anchor_table}__{projection.name}.sql": generator.render_template(
+            f"sqlite_{projection.kind}.j2", projection=projection, **_PROJECTION_HELPERS
+        )
+        for projection in projections
+    }
+
+
+def _render_projection_files(
+    generator: Generator, projections: List[Projection]
+) -> Dict[str, str]:
+    return {
+        "python/projections.py": generator.render_template(
+            "python_projections.j2",
+            projections=projections,
+            totals=[p for p in projections if p.kind == "totals"],
+            ledgers=[p for p in projections if p.kind == "ledger"],
+            **_PROJECTION_HELPERS,
+        ),
+        **_render_projection_sql(generator, projections),
+    }
+
+
+def _render_enums_files(
+    generator: Generator, enums: Dict[str, EnumDefinition]
+) -> Dict[str, str]:
+    return {"python/enums.py": generator.render_enums(enums)}
+
+
+def _render_entity_files(
+    generator: Generator, entity: EntityDefinition, enums: Dict[str, EnumDefinition]
+) -> Dict[str, str]:
+    files = {f"python/{entity.table}.py": generator.render_python(entity, enums)}
+    if generator.env:
+        files[f"python/repositories/{entity.table}.py"] = generator.render_repository(entity)
+    return files
+
+
+def _render_table_files(generator: Generator, entity: EntityDefinition) -> Dict[str, str]:
+    return {f"sql/{entity.table}.sql": generator.render_sql(entity)}
+
+
+def _render_init_files(
+    generator: Generator, entities: List[EntityDefinition]
+) -> Dict[str, str]:
+    return {"python/__init__.py": generator.render_init(entities)}
+
+
+_DART_HELPERS = {
+    "dart_identifier": _dart_identifier,
+    "dart_type": _dart_type,
+    "dart_from_map": _dart_from_map,
+    "dart_to_map": _dart_to_map,
+}
+
+
+def _render_dart_enums_files(
+    generator: Generator, enums: Dict[str, EnumDefinition]
+) -> Dict[str, str]:
+    return {"dart/enums.dart": generator.render_template("dart_enums.j2", enums=enums, **_DART_HELPERS)}
+
+
+def _render_dart_model_files(generator: Generator, entity: EntityDefinition) -> Dict[str, str]:
+    return {
+        f"dart/{entity.table}.dart": generator.render_template(
+            "dart_model.j2", entity=entity, **_DART_HELPERS
+        )
+    }
+
+
+@dataclass(frozen=True)
+class Target:
+    """A family of outputs planned from the resolved domain.
+
+    ``needs`` names the ``DomainDefinition`` sections the target reads; a run
+    skips it when all of them are empty. ``requires`` lists the targets whose
+    outputs it imports, and ``section`` the ``targets:`` key of the domain YAML
+    that enables it by default.
+    """
+
+    name: str
+    plan: Callable[[DomainDefinition, Generator], List[RenderUnit]]
+    needs: Tuple[str, ...]
+    requires: Tuple[str, ...] = ()
+    section: str = "python"
+    templates_only: bool = False
+
+    def wanted(self, domain: DomainDefinition, generator: Generator) -> bool:
+        if self.templates_only and not generator.env:
+            return False
+        return any(getattr(domain, need) for need in self.needs)
+
+
+TARGETS: Dict[str, Target] = {}
+
+
+def register_target(
+    name: str,
+    needs: Iterable[str],
+    requires: Iterable[str] = (),
+    section: str = "python",
+    templates_only: bool = False,
+) -> Callable:
+    """Register a planner as target ``name``; targets plan in registration order."""
+
+    def decorator(plan: Callable[[DomainDefinition, Generator], List[RenderUnit]]) -> Callable:
+        TARGETS[name] = Target(
+            name=name,
+            plan=plan,
+            needs=tuple(needs),
+            requires=tuple(requires),
+            section=section,
+            templates_only=templates_only,
+        )
+        return plan
+
+    return decorator
+
+
+def default_targets(domain: DomainDefinition) -> List[str]:
+    """Targets enabled by the domain's ``targets:`` section.
+
+    A section is on unless it sets ``enabled: false``; without a ``targets:``
+    section the Python and SQL targets run.
+    """
+    sections = domain.targets or {"python": {}, "sql": {}}
+    enabled = {
+        name
+        for name, config in sections.items()
+        if not (isinstance(config, dict) and config.get("enabled") is False)
+    }
+    return [name for name, target in TARGETS.items() if target.section in enabled]
+
+
+def resolve_targets(domain: DomainDefinition, names: Optional[Iterable[str]] = None) -> List[str]:
+    """Requested targets plus everything they require, in registration order."""
+    selected = set()
+    pending = list(default_targets(domain) if names is None else names)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        if name not in TARGETS:
+            raise ValueError(f"Unknown target {name!r}; expected one of {', '.join(TARGETS)}")
+        selected.add(name)
+        pending.extend(TARGETS[name].requires)
+    return [name for name in TARGETS if name in selected]
+
+
+@register_target("sqlalchemy", needs=("entities",))
+def _plan_sqlalchemy(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """Shared base, enums, models and repositories."""
+    units = [
+        RenderUnit(
+            key="base",
+            digest=content_digest(
+                GENERATOR_VERSION, generator.template_digest("python_base.j2")
+            ),
+            render=_render_base_files,
+        ),
+        RenderUnit(
+            key="enums",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_enums.j2"),
+                generator.digest("enums", domain.enums),
+            ),
+            render=partial(_render_enums_files, enums=domain.enums),
+        ),
+    ]
+    if generator.env:
+        units.append(
+            RenderUnit(
+                key="database",
+                digest=content_digest(
+                    GENERATOR_VERSION,
+                    generator.template_digest("python_database.j2"),
+                    domain.python_target,
+                ),
+                render=partial(_render_database_files, python_target=domain.python_target),
+            )
+        )
+        units.append(
+            RenderUnit(
+                key="repository",
+                digest=content_digest(
+                    GENERATOR_VERSION, generator.template_digest("python_repository_base.j2")
+                ),
+                render=_render_repository_base_files,
+            )
+        )
+
+    entity_templates = generator.template_digest("python_model.j2", "python_repository.j2")
     for entity in domain.entities:
-        write_file(
-            python_dir / f"{entity.table}.py",
-            generator.render_python(entity, domain.enums),
+        units.append(
+            RenderUnit(
+                key=f"entity:{entity.name}",
+                digest=content_digest(
+                    GENERATOR_VERSION,
+                    entity_templates,
+                    generator.digest(f"entity:{entity.name}", entity),
+                    generator.digest("enums", domain.enums),
+                ),
+                render=partial(_render_entity_files, entity=entity, enums=domain.enums),
+            )
         )
-        write_file(sql_dir / f"{entity.table}.sql", generator.render_sql(entity))
 
-    write_file(python_dir / "__init__.py", generator.render_init(domain.entities))
+    units.append(
+        RenderUnit(
+            key="init",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_init.j2"),
+                [(entity.name, entity.table) for entity in domain.entities],
+            ),
+            render=partial(_render_init_files, entities=domain.entities),
+        )
+    )
+    if generator.env:
+        units.append(
+            RenderUnit(
+                key="repositories",
+                digest=content_digest(
+                    GENERATOR_VERSION,
+                    generator.template_digest("python_repositories_init.j2"),
+                    [(entity.name, entity.table) for entity in domain.entities],
+                ),
+                render=partial(_render_repositories_init_files, entities=domain.entities),
+            )
+        )
+    return units
+
+
+@register_target("sqlite", needs=("entities",), section="sql")
+def _plan_sqlite(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """One DDL file per table; ``plan_units`` adds the consolidated schema."""
+    table_template = generator.template_digest("sqlite_table.j2")
+    units = []
+    for entity in domain.entities:
+        digest = content_digest(
+            GENERATOR_VERSION, table_template, generator.digest(f"entity:{entity.name}", entity)
+        )
+        # The schema renders tables itself, in foreign-key order.
+        units.append(
+            RenderUnit(
+                key=f"sql:{entity.name}",
+                digest=digest,
+                render=partial(_render_table_files, entity=entity),
+                sql_digest=digest,
+            )
+        )
+    return units
+
+
+@register_target("sync", needs=("sync_entities",), requires=("sqlalchemy",), templates_only=True)
+def _plan_sync(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="sync",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_sync.j2"),
+                [(entity.name, entity.table) for entity in domain.sync_entities],
+                domain.derived_columns,
+                domain.append_only_sync,
+            ),
+            render=partial(
+                _render_sync_files,
+                entities=domain.sync_entities,
+                derived_columns=domain.derived_columns,
+                append_only=domain.append_only_sync,
+            ),
+        )
+    ]
+
+
+@register_target("events", needs=("events",), requires=("sqlalchemy",), templates_only=True)
+def _plan_events(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="events",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest(
+                    "python_events.j2",
+                    "sqlite_events.j2",
+                    "python_outbox.j2",
+                    "sqlite_outbox.j2",
+                ),
+                domain.events,
+            ),
+            render=partial(_render_events_files, events=domain.events),
+            sql=_render_events_sql,
+            sql_digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("sqlite_events.j2", "sqlite_outbox.j2"),
+            ),
+        )
+    ]
+
+
+@register_target("export", needs=("entities",), requires=("sqlalchemy",), templates_only=True)
+def _plan_export(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """Chunked Arrow/Parquet/npy export typed from the resolved attributes."""
+    return [
+        RenderUnit(
+            key="export",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_export.j2"),
+                [
+                    (entity.table, generator.digest(f"attributes:{entity.name}", entity.attributes))
+                    for entity in domain.entities
+                ],
+            ),
+            render=partial(_render_export_files, entities=domain.entities),
+        )
+    ]
+
+
+@register_target("reports", needs=("reports",), requires=("export",), templates_only=True)
+def _plan_reports(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="reports",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_report.j2"),
+                domain.reports,
+            ),
+            render=partial(_render_report_files, reports=domain.reports),
+        )
+    ]
+
+
+@register_target("money", needs=("entities",), templates_only=True)
+def _plan_money(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """Integer-cents arithmetic; batch defaults follow the first totals projection."""
+    totals = next((p for p in domain.projections if p.kind == "totals"), None)
+    line_columns = totals.columns if totals else TOTALS_COLUMNS
+    columns = {
+        role: line_columns[role]
+        for role in ("quantity", "unit_price", "discount_percent", "tax_percent")
+    }
+    return [
+        RenderUnit(
+            key="money",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_money.j2"),
+                domain.money_columns,
+                columns,
+            ),
+            render=partial(
+                _render_money_files, money_columns=domain.money_columns, columns=columns
+            ),
+        )
+    ]
+
+
+@register_target(
+    "projections",
+    needs=("projections",),
+    requires=("sqlalchemy", "money"),
+    templates_only=True,
+)
+def _plan_projections(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="projections",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest(
+                    "python_projections.j2", "sqlite_totals.j2", "sqlite_ledger.j2"
+                ),
+                domain.projections,
+            ),
+            render=partial(_render_projection_files, projections=domain.projections),
+            sql=partial(_render_projection_sql, projections=domain.projections),
+            sql_digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("sqlite_totals.j2", "sqlite_ledger.j2"),
+                domain.projections,
+            ),
+        )
+    ]
+
+
+@register_target(
+    "counters", needs=("counted_tables",), requires=("sqlalchemy",), templates_only=True
+)
+def _plan_counters(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="counters",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest(
+                    "python_counters.j2",
+                    "sqlite_change_counter.j2",
+                    "sqlite_change_counter_triggers.j2",
+                ),
+                domain.counted_tables,
+            ),
+            render=partial(_render_counter_files, tables=domain.counted_tables),
+            sql=partial(_render_counter_sql, tables=domain.counted_tables),
+            sql_digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest(
+                    "sqlite_change_counter.j2", "sqlite_change_counter_triggers.j2"
+                ),
+                domain.counted_tables,
+            ),
+        )
+    ]
+
+
+@register_target(
+    "caches", needs=("caches",), requires=("sqlalchemy", "counters"), templates_only=True
+)
+def _plan_caches(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="caches",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_recipes.j2"),
+                domain.caches,
+            ),
+            render=partial(_render_cache_files, caches=domain.caches),
+        )
+    ]
+
+
+@register_target(
+    "queues", needs=("queues",), requires=("sqlalchemy", "counters"), templates_only=True
+)
+def _plan_queues(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    return [
+        RenderUnit(
+            key="queues",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_queue.j2", "sqlite_queue.j2"),
+                domain.queues,
+            ),
+            render=partial(_render_queue_files, queues=domain.queues),
+            sql=partial(_render_queue_sql, queues=domain.queues),
+            sql_digest=content_digest(
+                GENERATOR_VERSION, generator.template_digest("sqlite_queue.j2"), domain.queues
+            ),
+        )
+    ]
+
+
+@register_target("asyncio", needs=("entities",), requires=("sqlalchemy",), templates_only=True)
+def _plan_asyncio(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """``async_sessionmaker`` factory and ``run_sync`` repository wrappers."""
+    return [
+        RenderUnit(
+            key="async",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("python_async_database.j2"),
+                domain.python_target,
+            ),
+            render=partial(_render_async_files, python_target=domain.python_target),
+        )
+    ]
+
+
+@register_target("dart", needs=("entities",), section="dart", templates_only=True)
+def _plan_dart(domain: DomainDefinition, generator: Generator) -> List[RenderUnit]:
+    """Plain Dart classes with sqflite ``fromMap``/``toMap`` for the mobile app."""
+    units = [
+        RenderUnit(
+            key="dart:enums",
+            digest=content_digest(
+                GENERATOR_VERSION,
+                generator.template_digest("dart_enums.j2"),
+                generator.digest("enums", domain.enums),
+            ),
+            render=partial(_render_dart_enums_files, enums=domain.enums),
+        )
+    ]
+    model_template = generator.template_digest("dart_model.j2")
+    for entity in domain.entities:
+        units.append(
+            RenderUnit(
+                key=f"dart:{entity.name}",
+                digest=content_digest(
+                    GENERATOR_VERSION,
+                    model_template,
+                    generator.digest(f"entity:{entity.name}", entity),
+                ),
+                render=partial(_render_dart_model_files, entity=entity),
+            )
+        )
+    return units
+
+
+def plan_units(
+    domain: DomainDefinition,
+    generator: Generator,
+    targets: Optional[Iterable[str]] = None,
+) -> List[RenderUnit]:
+    """Describe every output of a run together with the digest of its inputs.
+
+    Only the requested ``targets`` (see ``resolve_targets``) are planned, all
+    from the same resolved ``domain``. Render callables are partials over
+    module-level functions so units can be shipped to worker processes.
+    Outputs without a builtin renderer are only planned when Jinja2 is
+    available.
+    """
+    selected = resolve_targets(domain, targets)
+    units: List[RenderUnit] = []
+    for name in selected:
+        target = TARGETS[name]
+        if target.wanted(domain, generator):
+            units.extend(replace(unit, target=name) for unit in target.plan(domain, generator))
+    if "sqlite" in selected and generator.env:
+        sql_units = [unit for unit in units if unit.sql_digest]
+        units.append(
+            RenderUnit(
+                key="schema",
+                digest=content_digest(
+                    GENERATOR_VERSION,
+                    generator.template_digest("sqlite_schema.j2"),
+                    domain.name,
+                    domain.version,
+                    [unit.sql_digest for unit in sql_units],
+                ),
+                render=partial(
+                    _render_schema_files,
+                    domain=domain,
+                    features=tuple(unit.sql for unit in sql_units if unit.sql is not None),
+                ),
+                target="sqlite",
+            )
+        )
+    return units
+
+
+_worker_generator: Optional[Generator] = None
+
+
+def _init_worker(templates_path: Path, cache_dir: Optional[Path]) -> None:
+    global _worker_generator
+    _worker_generator = Generator(templates_path, cache_dir)
+
+
+UnitResult = Tuple[List[Tuple[str, bool]], UnitTiming]
+
+
+def _write_unit(
+    generator: Generator,
+    render: Callable[[Generator], Dict[str, str]],
+    output_dir: Path,
+) -> UnitResult:
+    timing = UnitTiming()
+    generator.template_times = timing.templates
+    start = time.perf_counter()
+    files = render(generator)
+    timing.render = time.perf_counter() - start
+    results = []
+    for name, content in files.items():
+        written = write_file(output_dir / name, content)
+        if written:
+            timing.written += 1
+            timing.bytes_written += len(content.encode("utf-8"))
+        results.append((name, written))
+    timing.write = time.perf_counter() - start - timing.render
+    timing.files = len(results)
+    return results, timing
+
+
+def _write_unit_in_worker(
+    render: Callable[[Generator], Dict[str, str]], output_dir: Path
+) -> UnitResult:
+    return _write_unit(_worker_generator, render, output_dir)
+
+
+def worker_pool(generator: Generator, jobs: int) -> ProcessPoolExecutor:
+    """Process pool whose workers render with their own copy of ``generator``."""
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(generator.templates_path, generator.cache_dir),
+    )
+
+
+def _run_units(
+    units: List[RenderUnit],
+    generator: Generator,
+    output_dir: Path,
+    jobs: int,
+    executor: Optional[Executor] = None,
+) -> List[UnitResult]:
+    """Render and write ``units``, returning per-unit results in input order.
+
+    ``executor`` must come from ``worker_pool``; without one a pool is
+    started for this call alone.
+    """
+    if jobs == 1 or len(units) < 2:
+        return [_write_unit(generator, unit.render, output_dir) for unit in units]
+    if executor is None:
+        with worker_pool(generator, jobs) as pool:
+            return _run_units(units, generator, output_dir, jobs, pool)
+    return list(
+        executor.map(
+            _write_unit_in_worker,
+            [unit.render for unit in units],
+            [output_dir] * len(units),
+            chunksize=max(1, len(units) // (jobs * 4)),
+        )
+    )
+
+
+def render_domain(
+    domain: DomainDefinition,
+    output_dir: Path,
+    generator: Generator,
+    manifest: Manifest,
+    force: bool = False,
+    jobs: int = 1,
+    targets: Optional[Iterable[str]] = None,
+    timings: Optional[Timings] = None,
+    executor: Optional[Executor] = None,
+) -> GenerationReport:
+    """Render an already-resolved domain, updating ``manifest`` in place.
+
+    With explicit ``targets`` only their outputs are rendered or pruned; files
+    of other targets from earlier runs are left alone. ``timings`` collects
+    the plan, per-unit render/write and manifest times. Callers rendering
+    repeatedly with ``jobs`` above one can pass a long-lived ``worker_pool``.
+    """
+    report = GenerationReport()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with phase(timings, "plan"):
+        units = plan_units(domain, generator, targets)
+        pending: List[RenderUnit] = []
+        for unit in units:
+            if not force and manifest.is_fresh(unit.key, unit.digest):
+                report.skipped.append(unit.key)
+            else:
+                pending.append(unit)
+
+    results = _run_units(pending, generator, output_dir, jobs, executor)
+    for unit, (files, timing) in zip(pending, results):
+        for name, written in files:
+            if written:
+                report.written.append(output_dir / name)
+            else:
+                report.unchanged.append(output_dir / name)
+        manifest.record(unit.key, unit.digest, [name for name, _ in files], unit.target)
+        if timings is not None:
+            timing.key, timing.target = unit.key, unit.target
+            timings.add_unit(timing)
+
+    with phase(timings, "manifest"):
+        scope = None if targets is None else resolve_targets(domain, targets)
+        for name in manifest.prune((unit.key for unit in units), scope):
+            path = output_dir / name
+            if path.exists():
+                path.unlink()
+                report.removed.append(path)
+        manifest.save()
+
+    if timings is not None:
+        timings.entity_names = [entity.name for entity in domain.entities]
+        timings.skipped = list(report.skipped)
+        timings.removed = len(report.removed)
+    return report
+
+
+def generate(
+    domain_path: Path,
+    output_dir: Path,
+    force: bool = False,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    targets: Optional[Iterable[str]] = None,
+    timings: Optional[Timings] = None,
+) -> GenerationReport:
+    """Render the domain into ``output_dir``, skipping units whose inputs are unchanged.
+
+    The run is one pipeline: load and resolve the YAML once, plan the units of
+    the requested ``targets`` (default: those enabled in its ``targets:``
+    section), then render and write them.
+
+    Digests of each unit's inputs are kept in a manifest inside ``output_dir``;
+    ``force`` re-renders everything, but files are still only rewritten when
+    their bytes differ. With ``jobs`` above one, units are rendered and written
+    by a process pool; ``jobs`` of zero or less uses one worker per CPU. Every
+    unit owns distinct files, so the output is identical to a serial run.
+    The resolved domain and compiled template bytecode are cached in
+    ``cache_dir``, which defaults to ``.boteco-cache`` inside ``output_dir``.
+    Pass a ``Timings`` to record how long each phase, template and unit took.
+    """
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    if cache_dir is None:
+        cache_dir = output_dir / CACHE_DIR_NAME
+    loader = DomainLoader(domain_path, cache_dir)
+    domain = loader.load(timings)
+
+    generator = Generator(TEMPLATES_PATH, cache_dir)
+    with phase(timings, "manifest"):
+        manifest = Manifest.load(output_dir, GENERATOR_VERSION)
+    report = render_domain(
+        domain,
+        output_dir,
+        generator,
+        manifest,
+        force=force,
+        jobs=jobs,
+        targets=targets,
+        timings=timings,
+    )
+    if timings is not None:
+        timings.finish()
+    return report
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="BotecoPro domain generator")
     parser.add_argument("--input", "-i", type=Path, required=True, help="Path to domain YAML file")
     parser.add_argument("--out", "-o", type=Path, required=True, help="Output directory")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every file even if the manifest says it is up to date",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes used to render entities (0 uses every CPU)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=f"Resolved domain and template cache (default: <out>/{CACHE_DIR_NAME})",
+    )
+    parser.add_argument(
+        "--target",
+        "-t",
+        action="append",
+        dest="targets",
+        default=None,
+        help=f"Render only this target and what it requires; repeatable ({', '.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and regenerate when the domain or templates change",
+    )
+    parser.add_argument(
+        "--timings",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="JSON",
+        help="Print phase, template and entity timings; with a path, also write them as JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PSTATS",
+        help="Run under cProfile, dump the stats to this file and print the top functions",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and (args.timings is not None or args.profile is not None):
+        parser.error("--timings and --profile measure a single run; drop them with --watch")
+    return args
 
 
 def main(argv: Optional[Iterable[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["diff"]:
+        from .migrate import main as diff_main
+
+        diff_main(argv[1:])
+        return
     args = parse_args(argv)
-    generate(args.input, args.out)
+    if args.watch:
+        from .watch import watch
+
+        watch(
+            args.input, args.out, jobs=args.jobs, cache_dir=args.cache_dir, targets=args.targets
+        )
+        return
+    timings = Timings() if args.timings is not None else None
+    with profiled(args.profile):
+        report = generate(
+            args.input,
+            args.out,
+            force=args.force,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            targets=args.targets,
+            timings=timings,
+        )
+    if timings is not None:
+        print(timings.format(), file=sys.stderr)
+        if args.timings != "-":
+            timings.write_json(Path(args.timings))
+    if args.profile is not None:
+        print(top_functions(args.profile), file=sys.stderr)
+    print(
+        f"Generated {len(report.written)} files ({len(report.unchanged)} unchanged,"
+        f" {len(report.skipped)} units skipped) in {args.out}"
+    )
 
 
-__all__ = ["generate", "main", "DomainLoader", "Generator"]
+__all__ = [
+    "generate",
+    "main",
+    "DomainLoader",
+    "Generator",
+    "GenerationReport",
+    "GENERATOR_VERSION",
+    "render_domain",
+    "register_target",
+    "worker_pool",
+    "resolve_targets",
+    "Target",
+    "TARGETS",
+    "Timings",
+]
@@ -0,0 +1,117 @@
+"""Content-hash manifest used to skip unchanged generator outputs."""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+MANIFEST_NAME = ".boteco-manifest.json"
+
+
+def _canonical(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonical(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {str(key): _canonical(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def content_digest(*parts: Any) -> str:
+    """Return a stable SHA-256 digest for dataclasses, mappings and scalars."""
+    payload = json.dumps(
+        [_canonical(part) for part in parts],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Digest of the inputs for one render unit and the files it produced."""
+
+    digest: str
+    files: List[str] = field(default_factory=list)
+    target: str = ""
+
+
+@dataclass
+class Manifest:
+    """Per-unit digests stored next to the generated files."""
+
+    output_dir: Path
+    version: str
+    entries: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output_dir: Path, version: str) -> "Manifest":
+        """Read the manifest, returning an empty one if missing or unreadable."""
+        manifest = cls(output_dir=output_dir, version=version)
+        try:
+            data = json.loads(manifest.path.read_text())
+        except (OSError, ValueError):
+            return manifest
+        if not isinstance(data, dict) or data.get("version") != version:
+            return manifest
+        for key, entry in data.get("entries", {}).items():
+            manifest.entries[key] = ManifestEntry(
+                digest=entry.get("digest", ""),
+                files=list(entry.get("files", [])),
+                target=entry.get("target", ""),
+            )
+        return manifest
+
+    def is_fresh(self, key: str, digest: str) -> bool:
+        """True when ``key`` was rendered from ``digest`` and its files still exist."""
+        entry = self.entries.get(key)
+        if entry is None or entry.digest != digest:
+            return False
+        return all((self.output_dir / name).exists() for name in entry.files)
+
+    def record(self, key: str, digest: str, files: Iterable[str], target: str = "") -> None:
+        self.entries[key] = ManifestEntry(digest=digest, files=sorted(files), target=target)
+
+    def files(self) -> List[str]:
+        return sorted({name for entry in self.entries.values() for name in entry.files})
+
+    def prune(self, keys: Iterable[str], targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Drop entries not in ``keys`` and return files no remaining entry owns.
+
+        With ``targets``, entries recorded by other targets are kept.
+        """
+        keep = set(keys)
+        scope = None if targets is None else set(targets)
+        dropped = [
+            key
+            for key, entry in self.entries.items()
+            if key not in keep and (scope is None or entry.target in scope)
+        ]
+        orphaned = {name for key in dropped for name in self.entries.pop(key).files}
+        return sorted(orphaned - set(self.files()))
+
+    def save(self) -> None:
+        data = {
+            "version": self.version,
+            "entries": {
+                key: {"digest": entry.digest, "files": entry.files, "target": entry.target}
+                for key, entry in sorted(self.entries.items())
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(data, indent=2, sort_keys=True) + "\n"
+        if not self.path.exists() or self.path.read_text() != content:
+            self.path.write_text(content)
+
+
+__all__ = ["MANIFEST_NAME", "Manifest", "ManifestEntry", "content_digest"]
@@ -0,0 +1,482 @@
+"""Diff two domain versions into ordered, resumable SQLite migration steps.
+
+``boteco-generate diff --from old.yaml --to new.yaml`` compares the resolved
+domains table by table:
+
+* new entities get their generated ``CREATE TABLE``;
+* columns SQLite can add in place become ``ALTER TABLE ... ADD COLUMN``;
+* ``renamed_from`` on an attribute or ``storage.renamed_from`` on an entity
+  becomes a rename instead of a drop and add;
+* anything else (dropped, retyped or re-constrained columns) rebuilds the
+  table: create ``<table>__migrating``, copy rows over with batched
+  ``INSERT ... SELECT`` on rowid ranges, then drop and rename;
+* generated triggers and feature indexes are dropped up front and recreated
+  from the new domain at the end.
+
+The steps are written as numbered ``.sql`` files for review, and ``--apply``
+runs them against a database, recording progress in
+``schema_migration_progress`` so an interrupted run resumes where it stopped.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .generator import (
+    SCHEMA_FILE,
+    TEMPLATES_PATH,
+    AttributeDefinition,
+    DomainDefinition,
+    DomainLoader,
+    EntityDefinition,
+    Generator,
+    plan_units,
+    render_sql_content,
+    sqlite_column_def,
+    sqlite_default_literal,
+    sqlite_index_name,
+    sqlite_index_sql,
+)
+
+PROGRESS_TABLE = "schema_migration_progress"
+REBUILD_SUFFIX = "__migrating"
+DEFAULT_BATCH_SIZE = 50_000
+
+_GENERATED_OBJECT = re.compile(
+    r"CREATE\s+(TRIGGER|(?:UNIQUE\s+)?INDEX)\s+IF\s+NOT\s+EXISTS\s+\"?(\w+)", re.IGNORECASE
+)
+
+
+def split_statements(script: str) -> List[str]:
+    """Split SQL into complete statements, keeping trigger bodies intact."""
+    statements: List[str] = []
+    pending = ""
+    for line in script.splitlines(keepends=True):
+        if not pending and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ""
+    if pending.strip():
+        statements.append(pending.strip())
+    return statements
+
+
+def feature_sql(domain: DomainDefinition, generator: Generator) -> List[str]:
+    """Statements of every generated SQL file that is not an entity table."""
+    files: Dict[str, str] = {}
+    for unit in plan_units(domain, generator):
+        if unit.target != "sqlite":
+            files.update(unit.render(generator))
+    return [
+        statement
+        for path in sorted(p for p in files if p.startswith("sql/"))
+        for statement in split_statements(files[path])
+    ]
+
+
+@dataclass
+class TableCopy:
+    """Rows copied from ``source`` into ``target`` column by column."""
+
+    source: str
+    target: str
+    columns: List[str]
+    expressions: List[str]
+
+    def sql(self, batched: bool = True) -> str:
+        columns = ", ".join(f'"{name}"' for name in self.columns)
+        statement = (
+            f'INSERT INTO "{self.target}" ({columns})\n'
+            f'SELECT {", ".join(self.expressions)} FROM "{self.source}"'
+        )
+        if batched:
+            statement += "\nWHERE rowid > :start AND rowid <= :stop"
+        return statement + ";"
+
+
+@dataclass
+class MigrationStep:
+    name: str
+    statements: List[str] = field(default_factory=list)
+    copy: Optional[TableCopy] = None
+
+    def script(self) -> str:
+        lines = [f"-- {self.name}"]
+        if self.copy is not None:
+            lines.append(
+                "-- Copies every row at once when run by hand; --apply copies rowid"
+                " ranges in separate transactions and can resume."
+            )
+            lines.append(self.copy.sql(batched=False))
+        lines.extend(self.statements)
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class MigrationPlan:
+    steps: List[MigrationStep] = field(default_factory=list)
+    rebuilt: List[str] = field(default_factory=list)
+
+    @property
+    def digest(self) -> str:
+        """Identifies the plan in the progress table."""
+        digest = hashlib.sha256()
+        for step in self.steps:
+            digest.update(step.script().encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def scripts(self) -> Dict[str, str]:
+        width = max(3, len(str(len(self.steps))))
+        return {
+            f"{number:0{width}d}_{step.name}.sql": step.script()
+            for number, step in enumerate(self.steps, start=1)
+        }
+
+    def write(self, out_dir: Path) -> List[Path]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, script in self.scripts().items():
+            path = out_dir / name
+            path.write_text(script, encoding="utf-8")
+            written.append(path)
+        return written
+
+
+def _signature(attr: AttributeDefinition, single_primary_key: bool) -> Tuple:
+    # Everything that shows up in the table DDL for this column.
+    return (sqlite_column_def(attr, single_primary_key), attr.relation)
+
+
+def _single_primary_key(entity: EntityDefinition) -> bool:
+    return sum(1 for attr in entity.attributes if attr.primary_key) == 1
+
+
+def _indexes(entity: EntityDefinition) -> Dict[str, str]:
+    return {
+        sqlite_index_name(entity.table, idx, position): sqlite_index_sql(entity.table, idx, position)
+        for position, idx in enumerate(entity.indexes, start=1)
+    }
+
+
+def _can_add_in_place(attr: AttributeDefinition) -> bool:
+    # SQLite's ADD COLUMN cannot add keys, NOT NULL without a default, or a
+    # foreign key whose default is not NULL.
+    has_default = sqlite_default_literal(attr) is not None
+    if attr.primary_key or (not attr.nullable and not has_default):
+        return False
+    return not (attr.relation and has_default)
+
+
+def _add_column_sql(table: str, attr: AttributeDefinition) -> str:
+    column = sqlite_column_def(attr)
+    if attr.relation:
+        column += f' REFERENCES "{attr.relation[0]}"("{attr.relation[1]}")'
+    return f'ALTER TABLE "{table}" ADD COLUMN {column};'
+
+
+def _rebuild_steps(old: EntityDefinition, new: EntityDefinition) -> List[MigrationStep]:
+    old_columns = {attr.name for attr in old.attributes}
+    scratch = f"{new.table}{REBUILD_SUFFIX}"
+    columns: List[str] = []
+    expressions: List[str] = []
+    for attr in new.attributes:
+        default = sqlite_default_literal(attr)
+        source = attr.renamed_from or attr.name
+        if source not in old_columns:
+            source = attr.name if attr.name in old_columns else None
+        if source is not None and not attr.nullable and default is not None:
+            expressions.append(f'COALESCE("{source}", {default})')
+        elif source is not None:
+            expressions.append(f'"{source}"')
+        elif default is not None or attr.nullable:
+            continue  # the new table's DEFAULT (or NULL) fills it
+        else:
+            raise ValueError(
+                f"{new.name}.{attr.name} is NOT NULL without a default; "
+                f"give it one so existing {new.table} rows can be copied"
+            )
+        columns.append(attr.name)
+    ddl = render_sql_content(replace(new, table=scratch, indexes=[]))
+    return [
+        MigrationStep(f"rebuild_{new.table}_create", split_statements(ddl)),
+        MigrationStep(
+            f"rebuild_{new.table}_copy",
+            copy=TableCopy(new.table, scratch, columns, expressions),
+        ),
+        MigrationStep(
+            f"rebuild_{new.table}_swap",
+            [f'DROP TABLE "{new.table}";', f'ALTER TABLE "{scratch}" RENAME TO "{new.table}";']
+            + list(_indexes(new).values()),
+        ),
+    ]
+
+
+def diff_domains(
+    old: DomainDefinition,
+    new: DomainDefinition,
+    old_features: Iterable[str] = (),
+    new_features: Iterable[str] = (),
+) -> MigrationPlan:
+    """Ordered steps turning a database built from ``old`` into ``new``.
+
+    ``*_features`` are the statements of the non-entity SQL files (triggers,
+    feature tables and indexes); see ``feature_sql``.
+    """
+    plan = MigrationPlan()
+    old_features, new_features = list(old_features), list(new_features)
+    before = {entity.name: entity for entity in old.entities}
+    by_table = {entity.table: entity for entity in old.entities}
+    matched: Dict[str, EntityDefinition] = {}
+    creates: List[MigrationStep] = []
+    renames: List[MigrationStep] = []
+    alters: List[MigrationStep] = []
+    rebuilds: List[MigrationStep] = []
+    index_steps: List[MigrationStep] = []
+
+    for entity in new.entities:
+        previous = before.get(entity.name) or by_table.get(entity.table)
+        if previous is None and entity.renamed_from in by_table:
+            previous = by_table[entity.renamed_from]
+        if previous is None:
+            creates.append(
+                MigrationStep(f"create_{entity.table}", split_statements(render_sql_content(entity)))
+            )
+            continue
+        matched[previous.table] = entity
+        if previous.table != entity.table:
+            renames.append(
+                MigrationStep(
+                    f"rename_{previous.table}_to_{entity.table}",
+                    [f'ALTER TABLE "{previous.table}" RENAME TO "{entity.table}";'],
+                )
+            )
+
+        old_single = _single_primary_key(previous)
+        new_single = _single_primary_key(entity)
+        old_attrs = {attr.name: attr for attr in previous.attributes}
+        new_names = {attr.name for attr in entity.attributes}
+        statements: List[str] = []
+        rebuild = any(
+            name not in new_names
+            and not any(attr.renamed_from == name for attr in entity.attributes)
+            for name in old_attrs
+        )
+        for attr in entity.attributes:
+            source = attr.renamed_from
+            if attr.name not in old_attrs and source in old_attrs:
+                if _signature(old_attrs[source], old_single) != _signature(
+                    replace(attr, name=source), new_single
+                ):
+                    rebuild = True
+                statements.append(
+                    f'ALTER TABLE "{entity.table}" RENAME COLUMN "{source}" TO "{attr.name}";'
+                )
+            elif attr.name not in old_attrs:
+                if not _can_add_in_place(attr):
+                    rebuild = True
+                statements.append(_add_column_sql(entity.table, attr))
+            elif _signature(old_attrs[attr.name], old_single) != _signature(attr, new_single):
+                rebuild = True
+
+        if rebuild:
+            # The rebuild copies renamed columns itself; compare against the
+            # old layout under the (possibly renamed) table.
+            rebuilds.extend(_rebuild_steps(replace(previous, table=entity.table), entity))
+            plan.rebuilt.append(entity.table)
+            continue
+        if statements:
+            alters.append(MigrationStep(f"alter_{entity.table}", statements))
+
+        old_indexes = _indexes(replace(previous, table=entity.table))
+        new_indexes = _indexes(entity)
+        changed = [name for name, sql in old_indexes.items() if new_indexes.get(name) != sql]
+        added = [sql for name, sql in new_indexes.items() if old_indexes.get(name) != sql]
+        if changed or added:
+            index_steps.append(
+                MigrationStep(
+                    f"indexes_{entity.table}",
+                    [f'DROP INDEX IF EXISTS "{name}";' for name in changed] + added,
+                )
+            )
+
+    drops = [
+        MigrationStep(f"drop_{entity.table}", [f'DROP TABLE IF EXISTS "{entity.table}";'])
+        for entity in old.entities
+        if entity.table not in matched
+    ]
+
+    refresh = bool(plan.rebuilt or drops or renames) or old_features != new_features
+    if refresh and old_features:
+        objects = [
+            (kind.split()[-1].upper(), name)
+            for kind, name in (m.groups() for m in map(_GENERATED_OBJECT.search, old_features) if m)
+        ]
+        if objects:
+            plan.steps.append(
+                MigrationStep(
+                    "drop_generated_objects",
+                    [f'DROP {kind} IF EXISTS "{name}";' for kind, name in objects],
+                )
+            )
+    plan.steps += renames + creates + alters + rebuilds + index_steps + drops
+    if refresh and new_features:
+        plan.steps.append(MigrationStep("create_generated_objects", new_features))
+    return plan
+
+
+def schema_version_sql(domain: DomainDefinition, generator: Generator) -> List[str]:
+    """The ``schema_version`` statements of the domain's consolidated schema."""
+    unit = next((unit for unit in plan_units(domain, generator) if unit.key == "schema"), None)
+    if unit is None:
+        return []
+    script = unit.render(generator)[SCHEMA_FILE]
+    return [statement for statement in split_statements(script) if '"schema_version"' in statement]
+
+
+def diff_files(old_path: Path, new_path: Path) -> MigrationPlan:
+    """Load both domain files and diff them, generated feature SQL included.
+
+    The plan ends by recording the new domain in ``schema_version``.
+    """
+    generator = Generator(TEMPLATES_PATH)
+    old = DomainLoader(old_path).load()
+    new = DomainLoader(new_path).load()
+    plan = diff_domains(old, new, feature_sql(old, generator), feature_sql(new, generator))
+    version = schema_version_sql(new, generator)
+    if plan.steps and version:
+        plan.steps.append(MigrationStep("record_schema_version", version))
+    return plan
+
+
+@dataclass
+class MigrationReport:
+    plan: str
+    steps_run: int = 0
+    steps_skipped: int = 0
+    rows_copied: int = 0
+    foreign_key_violations: List[Tuple] = field(default_factory=list)
+
+
+def apply_plan(
+    database: Path,
+    plan: MigrationPlan,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[str, int, int], None]] = None,
+) -> MigrationReport:
+    """Run ``plan`` against the SQLite file ``database``, resuming if interrupted.
+
+    Each step commits together with its progress row; copies commit once per
+    rowid range of ``batch_size``. ``on_batch(step, position, last_rowid)`` is
+    called after every committed copy batch. Foreign keys are off while the
+    tables are swapped and checked once at the end.
+    """
+    report = MigrationReport(plan.digest)
+    conn = sqlite3.connect(str(database), isolation_level=None)
+    try:
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{PROGRESS_TABLE}" ('
+            " plan TEXT NOT NULL, step INTEGER NOT NULL, name TEXT NOT NULL,"
+            " position INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (plan, step))"
+        )
+        save = (
+            f'INSERT INTO "{PROGRESS_TABLE}" (plan, step, name, position, done) VALUES (?, ?, ?, ?, ?)'
+            " ON CONFLICT (plan, step) DO UPDATE SET position = excluded.position, done = excluded.done"
+        )
+        for number, step in enumerate(plan.steps, start=1):
+            state = conn.execute(
+                f'SELECT position, done FROM "{PROGRESS_TABLE}" WHERE plan = ? AND step = ?',
+                (report.plan, number),
+            ).fetchone()
+            position, done = state or (0, 0)
+            if done:
+                report.steps_skipped += 1
+                continue
+            if step.copy is not None:
+                copy_sql = step.copy.sql()
+                (last,) = conn.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{step.copy.source}"').fetchone()
+                while position < last:
+                    stop = position + batch_size
+                    conn.execute("BEGIN IMMEDIATE")
+                    copied = conn.execute(copy_sql, {"start": position, "stop": stop}).rowcount
+                    conn.execute(save, (report.plan, number, step.name, stop, 0))
+                    conn.execute("COMMIT")
+                    report.rows_copied += copied
+                    position = stop
+                    if on_batch is not None:
+                        on_batch(step.name, position, last)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in step.statements:
+                    conn.execute(statement)
+                conn.execute(save, (report.plan, number, step.name, position, 1))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            report.steps_run += 1
+        report.foreign_key_violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+    finally:
+        conn.close()
+    return report
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="boteco-generate diff", description="Diff two domain versions into SQLite migrations"
+    )
+    parser.add_argument("--from", dest="old", type=Path, required=True, help="Deployed domain YAML")
+    parser.add_argument("--to", dest="new", type=Path, required=True, help="Target domain YAML")
+    parser.add_argument("--out", "-o", type=Path, help="Write numbered .sql scripts here")
+    parser.add_argument("--apply", type=Path, metavar="DATABASE", help="Run the plan on this SQLite file")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rowid range copied per transaction when rebuilding tables",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> MigrationPlan:
+    args = parse_args(argv)
+    plan = diff_files(args.old, args.new)
+    if args.out:
+        for path in plan.write(args.out):
+            print(path)
+    elif not args.apply:
+        sys.stdout.write("\n".join(plan.scripts().values()))
+    if args.apply:
+        report = apply_plan(args.apply, plan, batch_size=args.batch_size)
+        print(
+            f"plan {report.plan}: {report.steps_run} steps run, {report.steps_skipped} already done, "
+            f"{report.rows_copied} rows copied"
+        )
+        if report.foreign_key_violations:
+            print(f"foreign key violations: {report.foreign_key_violations}", file=sys.stderr)
+    return plan
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "MigrationPlan",
+    "MigrationReport",
+    "MigrationStep",
+    "TableCopy",
+    "apply_plan",
+    "diff_domains",
+    "diff_files",
+    "feature_sql",
+    "main",
+    "schema_version_sql",
+    "split_statements",
+]
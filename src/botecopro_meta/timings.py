@@ -0,0 +1,177 @@
+"""Phase, template and unit timings of a generation run (``--timings``/``--profile``)."""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+PHASES = ("read", "cache", "parse", "resolve", "plan", "render", "write", "manifest")
+
+
+@dataclass
+class UnitTiming:
+    """Render and write time of one render unit and what it produced.
+
+    ``templates`` maps template names to ``[calls, seconds, load seconds]``;
+    loading includes compiling a template the first time a process uses it.
+    """
+
+    key: str = ""
+    target: str = ""
+    render: float = 0.0
+    write: float = 0.0
+    files: int = 0
+    written: int = 0
+    bytes_written: int = 0
+    templates: Dict[str, List[float]] = field(default_factory=dict)
+
+
+class Timings:
+    """Collects timings for one run; pass it to ``generate(timings=...)``.
+
+    ``render`` and ``write`` sum the time spent in every unit, so with
+    ``jobs`` above one they add up the workers and can exceed ``total``.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.phases: Dict[str, float] = {}
+        self.units: List[UnitTiming] = []
+        self.skipped: List[str] = []
+        self.removed = 0
+        self.entity_names: List[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_unit(self, unit: UnitTiming) -> None:
+        self.units.append(unit)
+        self.add("render", unit.render)
+        self.add("write", unit.write)
+
+    def finish(self) -> None:
+        self.total = time.perf_counter() - self.started
+
+    def templates(self) -> Dict[str, Dict[str, float]]:
+        """Calls, seconds and load seconds per template, slowest first."""
+        totals: Dict[str, List[float]] = {}
+        for unit in self.units:
+            for name, stats in unit.templates.items():
+                total = totals.setdefault(name, [0, 0.0, 0.0])
+                for position, value in enumerate(stats):
+                    total[position] += value
+        ranked = sorted(totals.items(), key=lambda item: -item[1][1])
+        return {
+            name: {"calls": int(calls), "seconds": seconds, "load_seconds": load}
+            for name, (calls, seconds, load) in ranked
+        }
+
+    def per_entity(self) -> Dict[str, Dict[str, float]]:
+        """Render/write seconds, files and bytes of the per-entity units, slowest first."""
+        names = set(self.entity_names)
+        totals: Dict[str, Dict[str, float]] = {}
+        for unit in self.units:
+            _, _, name = unit.key.rpartition(":")
+            if name not in names:
+                continue
+            total = totals.setdefault(name, {"seconds": 0.0, "files": 0, "bytes_written": 0})
+            total["seconds"] += unit.render + unit.write
+            total["files"] += unit.files
+            total["bytes_written"] += unit.bytes_written
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready summary of the run."""
+        return {
+            "total_seconds": self.total,
+            "phases": {name: self.phases[name] for name in PHASES if name in self.phases},
+            "templates": self.templates(),
+            "entities": self.per_entity(),
+            "units": [
+                {key: value for key, value in asdict(unit).items() if key != "templates"}
+                for unit in self.units
+            ],
+            "files": {
+                "written": sum(unit.written for unit in self.units),
+                "unchanged": sum(unit.files - unit.written for unit in self.units),
+                "removed": self.removed,
+            },
+            "bytes_written": sum(unit.bytes_written for unit in self.units),
+            "skipped": self.skipped,
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2) + "\n")
+
+    def format(self, top: int = 10) -> str:
+        """Human-readable report: phases, then the ``top`` templates and entities."""
+        summary = self.summary()
+        files = summary["files"]
+        lines = [
+            f"total {self.total * 1000:9.1f} ms  {files['written']} written,"
+            f" {files['unchanged']} unchanged, {len(self.skipped)} units skipped,"
+            f" {summary['bytes_written']} bytes"
+        ]
+        lines += [f"  {name:<10}{seconds * 1000:9.1f} ms" for name, seconds in summary["phases"].items()]
+        lines.append("templates:")
+        lines += [
+            f"  {name:<32}{stats['seconds'] * 1000:9.1f} ms  x{stats['calls']}"
+            f"  (load {stats['load_seconds'] * 1000:.1f} ms)"
+            for name, stats in list(summary["templates"].items())[:top]
+        ]
+        lines.append("entities:")
+        lines += [
+            f"  {name:<32}{stats['seconds'] * 1000:9.1f} ms  {stats['bytes_written']} bytes"
+            for name, stats in list(summary["entities"].items())[:top]
+        ]
+        return "\n".join(lines)
+
+
+def phase(timings: Optional[Timings], name: str) -> ContextManager[None]:
+    """``timings.phase(name)``, or a no-op without timings."""
+    return nullcontext() if timings is None else timings.phase(name)
+
+
+@contextmanager
+def profiled(path: Optional[Path]) -> Iterator[None]:
+    """Run the block under cProfile and dump the stats to ``path`` (no-op if None).
+
+    Only the calling process is profiled; use ``jobs=1`` to see rendering.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+
+def top_functions(path: Path, top: int = 25) -> str:
+    """The ``top`` functions by cumulative time from a pstats dump."""
+    stream = io.StringIO()
+    pstats.Stats(str(path), stream=stream).sort_stats("cumulative").print_stats(top)
+    return stream.getvalue()
+
+
+__all__ = ["PHASES", "Timings", "UnitTiming", "phase", "profiled", "top_functions"]
@@ -0,0 +1,181 @@
+"""Watch the domain and templates and regenerate only what changed."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .generator import (
+    CACHE_DIR_NAME,
+    GENERATOR_VERSION,
+    TEMPLATES_PATH,
+    DomainDefinition,
+    DomainLoader,
+    GenerationReport,
+    Generator,
+    render_domain,
+    worker_pool,
+)
+from .manifest import Manifest
+
+WATCHED_SUFFIXES = (".yaml", ".yml", ".j2")
+
+
+def changed_entities(
+    previous: Optional[DomainDefinition], current: DomainDefinition
+) -> List[str]:
+    """Names of entities whose resolved definition differs from ``previous``.
+
+    Relation attributes carry the resolved type of their target, so entities
+    referencing a changed primary key are reported as well.
+    """
+    if previous is None:
+        return [entity.name for entity in current.entities]
+    before = {entity.name: entity for entity in previous.entities}
+    return [
+        entity.name
+        for entity in current.entities
+        if before.get(entity.name) != entity
+    ]
+
+
+class Watcher:
+    """Keep the resolved domain, templates, digests and manifest in memory between runs.
+
+    With ``jobs`` above one the worker pool is started on the first render
+    and reused until ``close``.
+    """
+
+    def __init__(
+        self,
+        domain_path: Path,
+        output_dir: Path,
+        jobs: int = 1,
+        cache_dir: Optional[Path] = None,
+        watch_paths: Optional[Iterable[Path]] = None,
+        interval: float = 0.05,
+        debounce: float = 0.02,
+        targets: Optional[Iterable[str]] = None,
+    ):
+        self.domain_path = domain_path
+        self.output_dir = output_dir
+        self.jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self.targets = None if targets is None else list(targets)
+        self.interval = interval
+        self.debounce = debounce
+        self.watch_paths = list(watch_paths or [domain_path.parent, TEMPLATES_PATH])
+        self.cache_dir = cache_dir or output_dir / CACHE_DIR_NAME
+        self.generator = Generator(TEMPLATES_PATH, self.cache_dir)
+        self.manifest = Manifest.load(output_dir, GENERATOR_VERSION)
+        self.domain: Optional[DomainDefinition] = None
+        self.changed: List[str] = []
+        self._snapshot: Dict[Path, int] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def snapshot(self) -> Dict[Path, int]:
+        """Modification times of every watched domain and template file."""
+        state: Dict[Path, int] = {}
+        for root in self.watch_paths:
+            if root.is_file():
+                state[root] = root.stat().st_mtime_ns
+                continue
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if filename.endswith(WATCHED_SUFFIXES):
+                        path = Path(dirpath) / filename
+                        try:
+                            state[path] = path.stat().st_mtime_ns
+                        except FileNotFoundError:
+                            continue
+        return state
+
+    def regenerate(self) -> GenerationReport:
+        """Reload the domain and render only the units whose inputs changed."""
+        domain = DomainLoader(self.domain_path, self.cache_dir).load()
+        if self.jobs > 1 and self._executor is None:
+            self._executor = worker_pool(self.generator, self.jobs)
+        report = render_domain(
+            domain,
+            self.output_dir,
+            self.generator,
+            self.manifest,
+            jobs=self.jobs,
+            targets=self.targets,
+            executor=self._executor,
+        )
+        self.changed = changed_entities(self.domain, domain)
+        self.domain = domain
+        return report
+
+    def poll(self) -> Optional[GenerationReport]:
+        """Regenerate if any watched file changed since the last call."""
+        current = self.snapshot()
+        if current == self._snapshot:
+            return None
+        # Editors often save in several writes; wait until the tree settles.
+        while True:
+            time.sleep(self.debounce)
+            settled = self.snapshot()
+            if settled == current:
+                break
+            current = settled
+        self._snapshot = current
+        return self.regenerate()
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        self._snapshot = self.snapshot()
+        step: Callable[[], Optional[GenerationReport]] = self.regenerate
+        try:
+            while True:
+                try:
+                    self._timed(step)
+                except Exception as exc:  # keep watching while the YAML is mid-edit
+                    print(f"Error: {exc}")
+                step = self.poll
+                if stop.wait(self.interval):
+                    return
+        finally:
+            self.close()
+
+    def _timed(self, step: Callable[[], Optional[GenerationReport]]) -> None:
+        start = time.perf_counter()
+        report = step()
+        if report is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"Wrote {len(report.written)} file(s), {len(report.unchanged)} unchanged, "
+            f"{len(report.skipped)} unit(s) skipped in {elapsed_ms:.1f} ms "
+            f"(entities changed: {', '.join(self.changed) or 'none'})"
+        )
+
+
+def watch(
+    domain_path: Path,
+    output_dir: Path,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    targets: Optional[Iterable[str]] = None,
+) -> None:
+    """Regenerate ``output_dir`` whenever the domain or templates change."""
+    watcher = Watcher(
+        domain_path, output_dir, jobs=jobs, cache_dir=cache_dir, targets=targets
+    )
+    print(f"Watching {', '.join(str(path) for path in watcher.watch_paths)}")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["Watcher", "changed_entities", "watch"]
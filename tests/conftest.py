@@ -1,8 +1,72 @@
+import importlib
+import importlib.util
 import sys
+import uuid
 from pathlib import Path
 
+import pytest
+
 DIST_PACKAGES = Path("/usr/lib/python3/dist-packages")
 if DIST_PACKAGES.exists():
     sys.path.insert(0, str(DIST_PACKAGES))
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+DOMAIN_PATH = Path(__file__).resolve().parents[1] / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def import_generated(python_dir: Path):
+    """Import a generated ``python`` package under a unique module name."""
+    name = f"generated_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(
+        name, python_dir / "__init__.py", submodule_search_locations=[str(python_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def generated(tmp_path: Path):
+    """Generate the sample domain into ``tmp_path`` and import its package."""
+    from botecopro_meta.generator import generate
+
+    output_dir = tmp_path / "generated"
+    generate(DOMAIN_PATH, output_dir)
+    package = import_generated(output_dir / "python")
+    yield package
+    for module_name in [m for m in sys.modules if m.split(".")[0] == package.__name__]:
+        del sys.modules[module_name]
+
+
+def apply_schema(dbapi_connection, package) -> None:
+    """Run the consolidated schema next to ``package`` on a raw connection."""
+    schema = Path(package.__file__).resolve().parents[1] / "sql" / "schema.sql"
+    dbapi_connection.executescript(schema.read_text())
+
+
+@pytest.fixture
+def make_engine(generated, tmp_path: Path):
+    """Factory for tuned engines on file databases holding the generated schema."""
+    database = importlib.import_module(f"{generated.__name__}.database")
+    engines = []
+
+    def factory(name: str = "boteco.db"):
+        engine = database.create_engine(f"sqlite:///{tmp_path / name}")
+        raw = engine.raw_connection()
+        try:
+            apply_schema(raw.driver_connection, generated)
+        finally:
+            raw.close()
+        engines.append(engine)
+        return engine
+
+    yield factory
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
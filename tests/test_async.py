@@ -0,0 +1,58 @@
+import asyncio
+import importlib
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+
+def test_async_sessions_share_models_and_bulk_helpers(generated, tmp_path: Path) -> None:
+    aio = importlib.import_module(f"{generated.__name__}.async_database")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    Product = importlib.import_module(f"{generated.__name__}.product").Product
+
+    async def scenario() -> None:
+        engine = aio.create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cloud.db'}")
+        try:
+            await aio.create_schema_async(engine)
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+                assert (await aio.schema_version_async(conn))["domain"] == "botecopro_domain"
+
+            async with engine.begin() as conn:
+                products = aio.AsyncRepository(conn, repositories.ProductRepository)
+                rows = [{"id": i, "name": f"product {i}", "stock_current": 1.0} for i in range(1, 1201)]
+                assert await products.bulk_insert(rows) == 1200
+                assert await products.bulk_upsert([{"id": 7, "name": "chopp"}], update_columns=["name"]) == 1
+
+            Session = aio.create_async_sessionmaker(engine)
+
+            async def read(product_id: int) -> str:
+                async with Session() as session:
+                    found = await aio.AsyncRepository(session, repositories.ProductRepository).get_many(
+                        [product_id]
+                    )
+                    return found[product_id].name
+
+            # Many tablets served concurrently from one event loop.
+            names = await asyncio.gather(*(read(i) for i in range(1, 101)))
+            assert names[6] == "chopp" and names[0] == "product 1"
+
+            async with Session() as session:
+                product = (await session.execute(select(Product).where(Product.id == 7))).scalar_one()
+                session.expire(product, ["name"])
+                assert await product.awaitable_attrs.name == "chopp"
+
+                repository = aio.AsyncRepository(session, repositories.ProductRepository)
+                batches = [len(batch) async for batch in repository.iter_all(batch_size=500)]
+                assert batches == [500, 500, 200]
+                records = await repository.records()
+                assert isinstance(records[0], repositories.ProductRecord)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
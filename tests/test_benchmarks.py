@@ -0,0 +1,24 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks import run  # noqa: E402
+
+
+def test_benchmark_suite_emits_comparable_json(tmp_path: Path, capsys) -> None:
+    out = tmp_path / "bench.json"
+    report = run.main(["--sizes", "5", "--repeat", "1", "--out", str(out)])
+
+    saved = json.loads(out.read_text())
+    assert saved["results"].keys() == report["results"].keys()
+    assert "generate.warm[entities=5]" in saved["results"]
+    assert "sqlite.kds_poll[tickets=5000]" in saved["results"]
+    assert saved["results"]["sqlite.menu_records[items=500]"]["bytes_per_row"] > 0
+    assert all(result["median"] > 0 for result in saved["results"].values())
+
+    run.main(["--sizes", "5", "--repeat", "1", "--suite", "generator", "--compare", str(out)])
+    assert "generate.cold[entities=5]" in capsys.readouterr().out.split("\n\n")[-1]
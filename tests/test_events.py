@@ -0,0 +1,74 @@
+from pathlib import Path
+import importlib
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from botecopro_meta.generator import DomainLoader
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def test_loader_resolves_event_payloads() -> None:
+    domain = DomainLoader(DOMAIN_PATH).load()
+    events = {event.name: event for event in domain.events}
+
+    status_changed = events["ItemStatusChanged"]
+    assert status_changed.aggregate == "OrderItem"
+    assert status_changed.aggregate_field == "order_item_id"
+    assert [(f.name, f.python_name) for f in status_changed.fields][1] == ("from", "from_")
+    assert events["OrderClosed"].fields[1].base_type == "int"  # money_cents
+    assert events["StockConsumed"].aggregate_field is None
+
+
+def test_event_store_appends_and_replays_streams(generated, engine) -> None:
+    events = importlib.import_module(f"{generated.__name__}.events")
+    comanda_id = uuid4()
+
+    with engine.begin() as conn:
+        seqs = events.append_many(
+            conn,
+            [
+                events.OrderOpened(order_id=1, comanda_id=comanda_id, table_id=4, employee_id=None),
+                events.ItemAdded(order_item_id=10, order_id=1, item_id=3, quantity=2),
+                events.ItemStatusChanged(order_item_id=10, from_="new", to="cooking"),
+                events.OrderOpened(order_id=2, comanda_id=comanda_id, table_id=5, employee_id=7),
+            ],
+        )
+        assert seqs == [1, 2, 1, 1]
+        more = [events.ItemAdded(order_item_id=11 + i, order_id=1, item_id=1, quantity=1) for i in range(5)]
+        more.append(events.StockConsumed(aggregate_id="77", product_id=3, quantity=0.5, order_item_id=10))
+        assert events.append_many(conn, more, chunk_size=2) == [3, 4, 5, 6, 7, 1]
+
+    with engine.connect() as conn:
+        stream = list(events.iter_stream(conn, "Order", 1, batch_size=2))
+        assert [stored.seq for stored in stream] == list(range(1, 8))
+        opened = stream[0].event
+        assert opened == events.OrderOpened(order_id=1, comanda_id=comanda_id, table_id=4, employee_id=None)
+        assert [s.seq for s in events.iter_stream(conn, "Order", 1, after_seq=5)] == [6, 7]
+
+        changed = next(events.iter_stream(conn, "OrderItem", 10)).event
+        assert changed.from_ == "new"
+        payload = conn.execute(text("SELECT payload FROM domain_event WHERE type = 'ItemStatusChanged'")).scalar()
+        assert b'"from":"new"' in payload
+
+        consumed = next(events.iter_stream(conn, "StockMovement", 77)).event
+        assert consumed.aggregate_id == "77" and consumed.quantity == 0.5
+
+        quantity = events.replay(
+            conn, "Order", 1, lambda total, e: total + getattr(e, "quantity", 0), 0
+        )
+        assert quantity == 7
+
+        log = list(events.iter_events(conn, batch_size=3))
+        assert [s.position for s in log] == sorted(s.position for s in log) and len(log) == 10
+        added = list(events.iter_events(conn, after_position=log[1].position, types=["ItemAdded"]))
+        assert len(added) == 5
+
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM domain_event "
+                "WHERE aggregate = 'Order' AND aggregate_id = '1' AND seq > 0 ORDER BY seq"
+            )
+        ).all()
+        assert "idx_domain_event_stream" in " ".join(str(row[-1]) for row in plan)
@@ -0,0 +1,67 @@
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+def _seed(generated, engine) -> None:
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    with engine.begin() as conn:
+        repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+        repositories.PaymentRepository(conn).bulk_insert(
+            [
+                {
+                    "id": i,
+                    "comanda_id": "c1",
+                    "method": ("pix", "cash", "card")[i % 3],
+                    "amount_cents": 100 * i,
+                    "received_at": None if i % 4 == 0 else datetime(2024, 5, 1, 12, i % 60),
+                    "notes": "tip" if i % 5 == 0 else None,
+                }
+                for i in range(1, 251)
+            ]
+        )
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet", "npy"])
+def test_export_round_trips_typed_columns(generated, engine, tmp_path: Path, fmt: str) -> None:
+    if fmt != "npy":
+        pytest.importorskip("pyarrow")
+    export = importlib.import_module(f"{generated.__name__}.export")
+    _seed(generated, engine)
+
+    out = tmp_path / "exports"
+    results = export.export(engine, out, ["payment", "comanda"], fmt=fmt, chunk_size=64)
+    assert [(r.table, r.format, r.rows) for r in results] == [("payment", fmt, 250), ("comanda", fmt, 1)]
+
+    payments = export.load_table(out, "payment")
+    assert payments.rows == 250
+    assert payments["amount_cents"].dtype == np.int64
+    assert int(payments["amount_cents"].sum()) == 100 * sum(range(1, 251))
+    assert payments["method"].dtype == np.int8
+    assert list(payments.decode("method")[:3]) == ["cash", "card", "pix"]
+    assert payments["received_at"].dtype == np.dtype("datetime64[us]")
+    assert np.isnat(payments["received_at"][3]) and not payments.valid["received_at"][3]
+    assert str(payments["received_at"][0]) == "2024-05-01T12:01:00.000000"
+    assert payments.valid["notes"].sum() == 50 and payments["notes"][4] == "tip"
+
+    subset = export.load_table(out, "payment", ["method"])
+    assert list(subset.columns) == ["method"]
+    if fmt == "npy":
+        assert isinstance(payments["amount_cents"], np.memmap)
+
+
+def test_export_command_and_unknown_tables(generated, engine, tmp_path: Path, capsys) -> None:
+    export = importlib.import_module(f"{generated.__name__}.export")
+    _seed(generated, engine)
+    database = tmp_path / "boteco.db"
+
+    results = export.main(["--database", str(database), "--out", str(tmp_path / "x"), "--format", "npy"])
+    assert {r.table for r in results} == set(export.TABLES)
+    assert "payment: 250 rows" in capsys.readouterr().out
+    assert export.load_table(tmp_path / "x", "order_item").rows == 0
+
+    with pytest.raises(ValueError, match="Unknown tables: nope"):
+        export.export(engine, tmp_path / "y", ["nope"])
@@ -1,13 +1,17 @@
 from pathlib import Path
 import py_compile
+import re
+import shutil
 import sqlite3
 
+import pytest
+
 from botecopro_meta.generator import generate
-from botecopro_meta.generator import DomainLoader
+from botecopro_meta.generator import DomainLoader, dependency_order, resolve_targets
 
 
 def test_generate_outputs(tmp_path: Path) -> None:
-    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "tables" / "001_domain.yaml"
+    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
     output_dir = tmp_path / "generated"
 
     generate(domain_path, output_dir)
@@ -46,7 +50,7 @@ def test_generate_outputs(tmp_path: Path) -> None:
 
 
 def test_custom_datetime_base_type_mapping() -> None:
-    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "tables" / "001_domain.yaml"
+    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
 
     loader = DomainLoader(domain_path)
     domain = loader.load()
@@ -61,7 +65,7 @@ def test_custom_datetime_base_type_mapping() -> None:
 
 
 def test_domain_methods_are_loaded_and_rendered(tmp_path: Path) -> None:
-    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "tables" / "001_domain.yaml"
+    domain_path = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
 
     loader = DomainLoader(domain_path)
     domain = loader.load()
@@ -75,3 +79,110 @@ def test_domain_methods_are_loaded_and_rendered(tmp_path: Path) -> None:
     product_model = (output_dir / "python" / "product.py").read_text()
     assert "def calculate_stock_value(self)" in product_model
     assert "raise NotImplementedError" in product_model
+
+
+def test_domain_cache_reuses_resolution_until_yaml_changes(tmp_path: Path, monkeypatch) -> None:
+    source = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+    domain_path = tmp_path / "domain.yaml"
+    shutil.copy(source, domain_path)
+    cache_dir = tmp_path / "cache"
+
+    first = DomainLoader(domain_path, cache_dir).load()
+    assert list((cache_dir / "domain").glob("*.pickle"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached domain should skip resolution")
+
+    monkeypatch.setattr(DomainLoader, "_resolve", fail)
+    assert DomainLoader(domain_path, cache_dir).load() == first
+    monkeypatch.undo()
+
+    domain_path.write_text(domain_path.read_text().replace("table: supplier\n", "table: vendor\n"))
+    changed = DomainLoader(domain_path, cache_dir).load()
+    assert "vendor" in {entity.table for entity in changed.entities}
+
+    # A cache pickled against a module that no longer exists is re-parsed.
+    (cache_path,) = (cache_dir / "domain").glob("*.pickle")
+    cache_path.write_bytes(b"cbotecopro_meta.moved_away\nDomainDefinition\n.")
+    assert DomainLoader(domain_path, cache_dir).load() == changed
+
+
+def test_relation_and_sync_indexes_are_derived(tmp_path: Path) -> None:
+    source = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+    domain_path = tmp_path / "domain.yaml"
+    marker = "          target: Item\n          target_field: id\n          nullable: false\n"
+    text = source.read_text()
+    assert text.count(marker) == 1
+    domain_path.write_text(text.replace(marker, marker + "          index: false\n"))
+
+    output_dir = tmp_path / "generated"
+    generate(domain_path, output_dir)
+
+    conn = sqlite3.connect(":memory:")
+    for sql_file in sorted((output_dir / "sql").glob("*.sql")):
+        conn.executescript(sql_file.read_text())
+
+    def index_columns(table: str) -> set:
+        return {
+            tuple(row[2] for row in conn.execute(f"PRAGMA index_info('{idx[1]}')"))
+            for idx in conn.execute(f"PRAGMA index_list('{table}')")
+            if idx[3] == "c"
+        }
+
+    assert index_columns("order_item") == {("order_id",), ("dirty", "last_modified")}
+    assert ("comanda_id",) in index_columns("payment")
+    assert ("product_id",) in index_columns("stock_movement")
+    assert ("order_id",) in index_columns("kitchen_ticket")
+    # The leading primary-key column of item_product already serves item_id lookups.
+    assert index_columns("item_product") == {("product_id",)}
+    conn.close()
+
+
+def test_schema_sql_applies_in_one_script_in_dependency_order(tmp_path: Path) -> None:
+    source = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+    output_dir = tmp_path / "generated"
+    generate(source, output_dir)
+    schema = (output_dir / "sql" / "schema.sql").read_text()
+
+    created = re.findall(r'CREATE TABLE IF NOT EXISTS "(\w+)"', schema)
+    for entity in DomainLoader(source).load().entities:
+        for attr in entity.attributes:
+            if attr.relation and attr.relation[0] != entity.table:
+                assert created.index(attr.relation[0]) < created.index(entity.table)
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("PRAGMA foreign_keys=ON;")
+    conn.executescript(schema)
+    conn.executescript(schema)  # idempotent
+    assert conn.execute("SELECT domain, domain_version FROM schema_version").fetchall() == [
+        ("botecopro_domain", "1.0")
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] > 0
+    conn.close()
+
+    a, b = DomainLoader(source).load().entities[:2]
+    a.attributes[0].relation, b.attributes[0].relation = (b.table, "id"), (a.table, "id")
+    with pytest.raises(ValueError, match="cycle"):
+        dependency_order([a, b])
+
+
+def test_targets_render_only_what_was_requested(tmp_path: Path) -> None:
+    source = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+    domain = DomainLoader(source).load()
+    assert resolve_targets(domain, ["queues"]) == ["sqlalchemy", "counters", "queues"]
+    assert "dart" in resolve_targets(domain)
+    with pytest.raises(ValueError, match="Unknown target"):
+        resolve_targets(domain, ["cobol"])
+
+    output_dir = tmp_path / "generated"
+    generate(source, output_dir, targets=["sqlite"])
+    files = {p.relative_to(output_dir).parts[0] for p in output_dir.rglob("*.*") if ".boteco" not in str(p)}
+    assert files == {"sql"}
+    assert "CREATE TABLE" in (output_dir / "sql" / "schema.sql").read_text()
+
+    report = generate(source, output_dir, targets=["dart"])
+    assert (output_dir / "sql" / "category.sql").exists() and not report.removed
+    ticket = (output_dir / "dart" / "kitchen_ticket.dart").read_text()
+    assert "final TicketStatus status;" in ticket
+    assert "'created_at': createdAt?.toIso8601String()," in ticket
+    assert "  new_('new')," in (output_dir / "dart" / "enums.dart").read_text()
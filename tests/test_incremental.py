@@ -0,0 +1,122 @@
+from pathlib import Path
+import shutil
+
+from botecopro_meta.generator import (
+    CACHE_DIR_NAME,
+    TEMPLATES_PATH,
+    DomainLoader,
+    Generator,
+    generate,
+    get_environment,
+    plan_units,
+)
+from botecopro_meta.manifest import MANIFEST_NAME
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def test_noop_regeneration_skips_every_unit(tmp_path: Path) -> None:
+    output_dir = tmp_path / "generated"
+    first = generate(DOMAIN_PATH, output_dir)
+    assert first.written
+    assert (output_dir / MANIFEST_NAME).exists()
+
+    mtimes = {path: path.stat().st_mtime_ns for path in output_dir.rglob("*.py")}
+    second = generate(DOMAIN_PATH, output_dir)
+
+    assert second.written == []
+    assert "entity:Product" in second.skipped
+    assert mtimes == {path: path.stat().st_mtime_ns for path in output_dir.rglob("*.py")}
+
+
+def test_only_changed_entities_are_rendered(tmp_path: Path) -> None:
+    domain_path = tmp_path / "domain.yaml"
+    shutil.copy(DOMAIN_PATH, domain_path)
+    output_dir = tmp_path / "generated"
+    generate(domain_path, output_dir)
+
+    text = domain_path.read_text()
+    marker = "        table: supplier\n      attributes:\n"
+    domain_path.write_text(text.replace(marker, marker + "        rating:\n          type: int\n", 1))
+    report = generate(domain_path, output_dir)
+
+    assert sorted(report.written) == [
+        output_dir / "dart" / "supplier.dart",
+        output_dir / "python" / "export.py",
+        output_dir / "python" / "repositories" / "supplier.py",
+        output_dir / "python" / "supplier.py",
+        output_dir / "sql" / "schema.sql",
+        output_dir / "sql" / "supplier.sql",
+    ]
+    assert "entity:Product" in report.skipped
+    assert "entity:SupplierProduct" in report.skipped
+    assert "sql:Product" in report.skipped
+
+
+def test_deleted_output_and_force_rerender(tmp_path: Path) -> None:
+    output_dir = tmp_path / "generated"
+    generate(DOMAIN_PATH, output_dir)
+
+    (output_dir / "sql" / "category.sql").unlink()
+    report = generate(DOMAIN_PATH, output_dir)
+    assert report.written == [output_dir / "sql" / "category.sql"]
+
+    forced = generate(DOMAIN_PATH, output_dir, force=True)
+    assert forced.skipped == []
+    assert forced.written == []
+
+
+def test_parallel_generation_matches_serial(tmp_path: Path) -> None:
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    generate(DOMAIN_PATH, serial_dir, jobs=1)
+    report = generate(DOMAIN_PATH, parallel_dir, jobs=3)
+
+    def outputs(root: Path) -> list:
+        return sorted(
+            p.relative_to(root)
+            for p in root.rglob("*")
+            if p.is_file() and CACHE_DIR_NAME not in p.parts
+        )
+
+    serial_files = outputs(serial_dir)
+    parallel_files = outputs(parallel_dir)
+    assert serial_files == parallel_files
+    for name in serial_files:
+        assert (serial_dir / name).read_bytes() == (parallel_dir / name).read_bytes()
+    assert [path.relative_to(parallel_dir) for path in report.written][:2] == [
+        Path("python/base.py"),
+        Path("python/enums.py"),
+    ]
+
+
+def test_template_bytecode_is_cached_on_disk(tmp_path: Path) -> None:
+    output_dir = tmp_path / "generated"
+    cache_dir = tmp_path / "cache"
+    generate(DOMAIN_PATH, output_dir, cache_dir=cache_dir)
+
+    assert list((cache_dir / "jinja").glob("*.cache"))
+    env = get_environment(TEMPLATES_PATH, cache_dir)
+    assert env is get_environment(TEMPLATES_PATH, cache_dir)
+    assert env.bytecode_cache is not None
+
+
+def test_schema_unit_follows_only_sql_inputs(tmp_path: Path) -> None:
+    templates = tmp_path / "templates"
+    shutil.copytree(TEMPLATES_PATH, templates)
+    domain = DomainLoader(DOMAIN_PATH).load()
+
+    def digests() -> dict:
+        generator = Generator(templates)
+        return {unit.key: unit.digest for unit in plan_units(domain, generator)}
+
+    before = digests()
+    python_only = templates / "python_projections.j2"
+    python_only.write_text(python_only.read_text() + "\n# python only\n")
+    after = digests()
+    assert after["projections"] != before["projections"]
+    assert after["schema"] == before["schema"]
+
+    sql = templates / "sqlite_ledger.j2"
+    sql.write_text(sql.read_text() + "\n-- sql\n")
+    assert digests()["schema"] != after["schema"]
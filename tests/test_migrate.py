@@ -0,0 +1,126 @@
+from pathlib import Path
+import sqlite3
+
+import pytest
+import yaml
+
+from botecopro_meta.generator import main as generator_main
+from botecopro_meta.migrate import apply_plan, diff_files, split_statements
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def _evolve(tmp_path: Path) -> Path:
+    data = yaml.safe_load(DOMAIN_PATH.read_text())
+    entities = data["botecopro_domain"]["entities"]
+    entities["Item"]["attributes"]["menu_position"] = {"type": "int", "nullable": True}
+    entities["Supplier"]["attributes"]["contact_phone"] = entities["Supplier"]["attributes"].pop("phone")
+    entities["Supplier"]["attributes"]["contact_phone"]["renamed_from"] = "phone"
+    # NOT NULL with a default cannot be added in place: comanda is rebuilt.
+    entities["Comanda"]["attributes"]["notes"] = {"type": "string", "nullable": False, "default": ""}
+    entities["Promotion"] = {
+        "storage": {"table": "promotion"},
+        "attributes": {"id": {"type": "int", "primary_key": True}, "name": {"type": "string"}},
+    }
+    del entities["PaymentSplit"]
+    path = tmp_path / "002_domain.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+    return path
+
+
+def _schema(path: Path) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        names = conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+            " AND name != 'schema_migration_progress'"
+        ).fetchall()
+        columns = {
+            name: [row[1:6] for row in conn.execute(f'PRAGMA table_info("{name}")')]
+            for kind, name in names
+            if kind == "table"
+        }
+        return {"objects": sorted(names), "columns": columns}
+    finally:
+        conn.close()
+
+
+def _build(sql_dir: Path, database: Path) -> None:
+    conn = sqlite3.connect(database)
+    conn.executescript((sql_dir / "schema.sql").read_text())
+    conn.close()
+
+
+def test_split_statements_keeps_trigger_bodies() -> None:
+    script = "-- header\nCREATE TABLE t (a);\n\nCREATE TRIGGER x AFTER INSERT ON t\nBEGIN\n  SELECT 1;\n  SELECT 2;\nEND;\n"
+    assert split_statements(script) == [
+        "CREATE TABLE t (a);",
+        "CREATE TRIGGER x AFTER INSERT ON t\nBEGIN\n  SELECT 1;\n  SELECT 2;\nEND;",
+    ]
+
+
+def test_diff_migrates_a_populated_database_resumably(tmp_path: Path) -> None:
+    new_path = _evolve(tmp_path)
+    plan = diff_files(DOMAIN_PATH, new_path)
+    names = [step.name for step in plan.steps]
+    assert names[0] == "drop_generated_objects"
+    assert names[-2:] == ["create_generated_objects", "record_schema_version"]
+    assert {"create_promotion", "alter_item", "alter_supplier", "drop_payment_split"} <= set(names)
+    assert plan.rebuilt == ["comanda"]
+    assert names.index("rebuild_comanda_create") < names.index("rebuild_comanda_copy") < names.index(
+        "rebuild_comanda_swap"
+    )
+    assert 'ALTER TABLE "supplier" RENAME COLUMN "phone" TO "contact_phone";' in plan.steps[
+        names.index("alter_supplier")
+    ].statements
+
+    generator_main(["--input", str(DOMAIN_PATH), "--out", str(tmp_path / "old")])
+    database = tmp_path / "tablet.db"
+    _build(tmp_path / "old" / "sql", database)
+    conn = sqlite3.connect(database)
+    conn.executemany(
+        "INSERT INTO comanda (id, status, notes) VALUES (?, 'open', ?)",
+        [(f"c{i}", None if i % 2 else "window") for i in range(7)],
+    )
+    conn.execute("INSERT INTO supplier (id, name, phone) VALUES (1, 'acme', '555')")
+    conn.commit()
+    conn.close()
+
+    def interrupt(step: str, position: int, last: int) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        apply_plan(database, plan, batch_size=3, on_batch=interrupt)
+    report = apply_plan(database, plan, batch_size=3)
+    assert report.steps_skipped > 0 and report.rows_copied == 4
+    assert not report.foreign_key_violations
+    assert apply_plan(database, plan).steps_run == 0
+
+    generator_main(["--input", str(new_path), "--out", str(tmp_path / "new")])
+    fresh = tmp_path / "fresh.db"
+    _build(tmp_path / "new" / "sql", fresh)
+    migrated, expected = _schema(database), _schema(fresh)
+    assert migrated["objects"] == expected["objects"]
+    version = "SELECT domain_version, schema_digest FROM schema_version"
+    assert sqlite3.connect(database).execute(version).fetchone() == sqlite3.connect(fresh).execute(version).fetchone()
+    for table, columns in expected["columns"].items():
+        assert sorted(migrated["columns"][table]) == sorted(columns), table
+
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT COUNT(*), SUM(notes = 'window') FROM comanda").fetchone() == (7, 4)
+    assert conn.execute("SELECT contact_phone FROM supplier").fetchone() == ("555",)
+    # Triggers dropped with the old comanda table are back and maintain totals.
+    conn.execute("INSERT INTO item (id, name, item_type) VALUES (1, 'chopp', 'drink')")
+    conn.execute("INSERT INTO \"order\" (id, comanda_id, origin, status) VALUES (1, 'c1', 'table', 'open')")
+    conn.execute("INSERT INTO order_item (order_id, item_id, quantity, unit_price_cents) VALUES (1, 1, 2, 500)")
+    assert conn.execute("SELECT total_cents FROM comanda WHERE id = 'c1'").fetchone() == (1000,)
+    conn.close()
+
+
+def test_diff_cli_writes_numbered_scripts(tmp_path: Path) -> None:
+    new_path = _evolve(tmp_path)
+    generator_main(["diff", "--from", str(DOMAIN_PATH), "--to", str(new_path), "--out", str(tmp_path / "mig")])
+    scripts = sorted(p.name for p in (tmp_path / "mig").glob("*.sql"))
+    assert scripts[0] == "001_drop_generated_objects.sql"
+    copy = next(p for p in (tmp_path / "mig").glob("*_rebuild_comanda_copy.sql"))
+    assert 'INSERT INTO "comanda__migrating"' in copy.read_text()
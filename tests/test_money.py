@@ -0,0 +1,98 @@
+from pathlib import Path
+import importlib
+import random
+
+import pytest
+import yaml
+from sqlalchemy import text
+
+from botecopro_meta.generator import DomainLoader
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def test_closing_a_comanda_matches_the_triggers_on_both_paths(generated, engine, monkeypatch) -> None:
+    money = importlib.import_module(f"{generated.__name__}.money")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    assert money.MONEY_COLUMNS["order_item"] == ("unit_price_cents", "total_cents")
+
+    rng = random.Random(7)
+    lines = [
+        {
+            "id": i,
+            "order_id": 1,
+            "item_id": 1,
+            "quantity": rng.randint(1, 6),
+            "unit_price_cents": rng.randint(1, 9999),
+            "discount_percent": rng.choice([None, 5.0, 10.0, 12.345, 33.335]),
+            "tax_percent": rng.choice([None, 8.0, 12.5, 0.005]),
+        }
+        for i in range(1, 41)
+    ]
+    with engine.begin() as conn:
+        repositories.ItemRepository(conn).bulk_insert([{"id": 1, "name": "chopp", "item_type": "drink"}])
+        repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+        repositories.OrderRepository(conn).bulk_insert(
+            [{"id": 1, "comanda_id": "c1", "origin": "table", "status": "open"}]
+        )
+        order_items = repositories.OrderItemRepository(conn)
+        order_items.bulk_insert(lines)
+        stored = conn.execute(text("SELECT total_cents FROM order_item ORDER BY id")).scalars().all()
+        comanda = conn.execute(text("SELECT subtotal_cents, total_cents FROM comanda")).one()
+        records = order_items.records(order_items.record_select().order_by(text("id")))
+
+    for numpy in (money.np, None):
+        monkeypatch.setattr(money, "np", numpy)
+        batch = money.Lines.from_rows(records)
+        assert [int(total) for total in money.line_totals(batch)] == stored
+        totals = money.totals(batch)
+        assert (totals.subtotal, totals.total) == tuple(comanda)
+        assert totals.total == totals.subtotal - totals.discount + totals.tax
+        assert all(type(value) is int for value in (totals.subtotal, totals.discount, totals.tax))
+        assert money.totals(money.Lines.from_rows(lines)) == totals
+    assert [
+        money.line_total_cents(
+            line["quantity"], line["unit_price_cents"], line["discount_percent"], line["tax_percent"]
+        )
+        for line in lines
+    ] == stored
+
+
+def test_allocate_and_payment_splits_sum_exactly(generated, engine) -> None:
+    money = importlib.import_module(f"{generated.__name__}.money")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+
+    assert money.split_even(1000, 3) == [334, 333, 333]
+    assert money.allocate(-1000, [1, 1, 1]) == [-334, -333, -333]
+    assert money.allocate(101, [3, 1]) == [76, 25]
+    with pytest.raises(ValueError):
+        money.allocate(100, [0, 0])
+    assert (money.apply_discount(999, 10.0), money.apply_tax(899, 12.5)) == (899, 1011)
+    assert money.format_cents(-1205) == "-12.05"
+    assert money.parse_cents("12.3") == 1230 and money.parse_cents("-0.05") == -5
+    with pytest.raises(ValueError):
+        money.parse_cents("1.234")
+
+    payees = ["ana", "bia", "caio"]
+    with engine.begin() as conn:
+        repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+        repositories.PaymentRepository(conn).bulk_insert(
+            [{"id": 1, "comanda_id": "c1", "method": "pix", "amount_cents": 10001}]
+        )
+        repositories.PaymentSplitRepository(conn).bulk_insert(
+            [
+                {"payment_id": 1, "payee_name": payee, "amount_cents": amount}
+                for payee, amount in zip(payees, money.allocate(10001, [2, 1, 1]))
+            ]
+        )
+        amounts = conn.execute(text("SELECT amount_cents FROM payment_split ORDER BY id")).scalars().all()
+    assert amounts == [5001, 2500, 2500]
+
+
+def test_money_columns_must_be_integer_cents(tmp_path: Path) -> None:
+    data = yaml.safe_load(DOMAIN_PATH.read_text())
+    data["botecopro_domain"]["entities"]["Payment"]["attributes"]["amount_cents"]["type"] = "float"
+    path = tmp_path / "domain.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+    with pytest.raises(ValueError, match="Payment.amount_cents"):
+        DomainLoader(path).load()
@@ -0,0 +1,85 @@
+import importlib
+import json
+import queue
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+
+def test_outbox_records_in_transaction_and_drains_at_least_once(generated, engine, tmp_path: Path) -> None:
+    events = importlib.import_module(f"{generated.__name__}.events")
+    outbox = importlib.import_module(f"{generated.__name__}.outbox")
+    database = importlib.import_module(f"{generated.__name__}.database")
+    Session = database.create_sessionmaker(engine)
+
+    with Session.begin() as session:
+        session.add(generated.Category(id=1, name="drinks"))
+        outbox.record_events(session, [events.OrderOpened(order_id=1, comanda_id=None, table_id=1, employee_id=1)])
+    with pytest.raises(RuntimeError):
+        with Session.begin() as session:
+            session.add(generated.Category(id=2, name="food"))
+            outbox.record_events(session, [events.OrderClosed(order_id=1, total_cents=100)])
+            raise RuntimeError("rolled back with the entity change")
+
+    class Flaky:
+        def __init__(self):
+            self.calls = 0
+            self.seen = []
+
+        def publish(self, batch):
+            self.calls += 1
+            self.seen.extend(stored.position for stored in batch)
+            if self.calls == 1:
+                raise ConnectionError("broker down")
+
+    flaky = Flaky()
+    drain = outbox.OutboxDrain(engine, "stock", flaky, batch_size=2)
+    with pytest.raises(ConnectionError):
+        drain.drain_once()
+    assert drain.lag().events == 1
+    assert drain.drain() == 1
+    assert flaky.seen[0] == flaky.seen[1]  # redelivered after the failure
+    assert drain.lag().events == 0
+
+    with engine.begin() as conn:
+        outbox.record_events(conn, [events.ItemAdded(order_item_id=i, order_id=1, item_id=1, quantity=1) for i in range(5)])
+    log = tmp_path / "events.jsonl"
+    assert outbox.OutboxDrain(engine, "audit", outbox.JsonLinesPublisher(log), batch_size=4).drain() == 6
+    lines = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [line["type"] for line in lines[:2]] == ["OrderOpened", "ItemAdded"]
+    assert lines[-1]["payload"]["order_item_id"] == 4
+
+
+def test_outbox_worker_wakes_on_commit(generated, engine) -> None:
+    events = importlib.import_module(f"{generated.__name__}.events")
+    outbox = importlib.import_module(f"{generated.__name__}.outbox")
+
+    delivered: "queue.Queue" = queue.Queue(maxsize=100)
+    drain = outbox.OutboxDrain(
+        engine, "kds", outbox.QueuePublisher(delivered), types=["ItemStatusChanged"], poll_interval=10
+    )
+    drain.start()
+    signal = drain._signal
+    try:
+        time.sleep(0.05)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            outbox.record_events(
+                conn,
+                [
+                    events.ItemAdded(order_item_id=1, order_id=1, item_id=1, quantity=1),
+                    events.ItemStatusChanged(order_item_id=1, from_="new", to="cooking"),
+                ],
+            )
+        stored = delivered.get(timeout=2)
+        assert time.perf_counter() - started < 1  # woken by the commit, not the 10 s poll
+        assert stored.event.to == "cooking"
+        assert delivered.empty()
+    finally:
+        drain.stop(timeout=2)
+    assert drain.stats.delivered == 1
+    assert drain.lag().events == 0
+    assert not event.contains(engine, "commit", signal._on_commit)
+
@@ -0,0 +1,189 @@
+from pathlib import Path
+import importlib
+
+import pytest
+import yaml
+from sqlalchemy import text
+
+from botecopro_meta.generator import DomainLoader
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def _totals(conn, comanda_id):
+    return tuple(
+        conn.execute(
+            text("SELECT subtotal_cents, total_cents FROM comanda WHERE id = :id"), {"id": comanda_id}
+        ).one()
+    )
+
+
+def test_projections_resolve_relations() -> None:
+    projection, ledger = DomainLoader(DOMAIN_PATH).load().projections
+    assert (projection.target_table, projection.through_table, projection.lines_table) == (
+        "comanda",
+        "order",
+        "order_item",
+    )
+    assert (projection.target_fk, projection.line_fk, projection.status) == ("comanda_id", "order_id", "status")
+    assert projection.derived_columns == {"comanda": ["subtotal_cents", "total_cents"], "order_item": ["total_cents"]}
+
+    assert (ledger.target_table, ledger.balance, ledger.movement_fk) == ("product", "stock_current", "product_id")
+    assert ledger.signs == {"in": 1, "out": -1, "adjustment": 1}
+    consume = ledger.consume
+    assert (consume.function_name, consume.recipe_item_fk, consume.line_item_fk) == (
+        "consume_for_order_items",
+        "item_id",
+        "item_id",
+    )
+    assert consume.movement_line_fk == "related_order_item"
+
+
+@pytest.mark.parametrize(
+    "section, name, key, message",
+    [
+        ("caches", "recipes", "cost", "Cache recipes: Product has no column 'nope'"),
+        ("queues", "kitchen_queue", "order_by", "Queue kitchen_queue: KitchenTicket has no column 'nope'"),
+        ("reports", "analytics", "at", "Report analytics: Order has no column 'nope'"),
+    ],
+)
+def test_shared_column_errors_name_their_section(tmp_path: Path, section, name, key, message) -> None:
+    data = yaml.safe_load(DOMAIN_PATH.read_text())
+    data["botecopro_domain"][section][name][key] = "nope"
+    path = tmp_path / "domain.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+    with pytest.raises(ValueError, match=f"^{message}$"):
+        DomainLoader(path).load()
+
+
+def test_triggers_maintain_comanda_totals(generated, engine) -> None:
+    projections = importlib.import_module(f"{generated.__name__}.projections")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+
+    with engine.begin() as conn:
+        repositories.ItemRepository(conn).bulk_insert([{"id": 1, "name": "chopp", "item_type": "drink"}])
+        repositories.ComandaRepository(conn).bulk_insert(
+            [{"id": "c1", "status": "open"}, {"id": "c2", "status": "open"}]
+        )
+        repositories.OrderRepository(conn).bulk_insert(
+            [
+                {"id": 1, "comanda_id": "c1", "origin": "table", "status": "open"},
+                {"id": 2, "comanda_id": "c1", "origin": "table", "status": "open"},
+                {"id": 3, "comanda_id": "c2", "origin": "table", "status": "open"},
+            ]
+        )
+        items = repositories.OrderItemRepository(conn)
+        items.bulk_insert(
+            [
+                {"id": 1, "order_id": 1, "item_id": 1, "quantity": 2, "unit_price_cents": 1250},
+                {"id": 2, "order_id": 1, "item_id": 1, "quantity": 1, "unit_price_cents": 999,
+                 "discount_percent": 10.0, "tax_percent": 12.5},
+                {"id": 3, "order_id": 2, "item_id": 1, "quantity": 3, "unit_price_cents": 500},
+            ]
+        )
+        line = projections.line_total_cents(1, 999, 10.0, 12.5)
+        assert line == 1011
+        assert conn.execute(text("SELECT total_cents FROM order_item WHERE id = 2")).scalar() == line
+        assert _totals(conn, "c1") == (2500 + 999 + 1500, 2500 + line + 1500)
+
+        conn.execute(text("UPDATE order_item SET quantity = 4 WHERE id = 3"))
+        conn.execute(text("UPDATE order_item SET order_id = 3 WHERE id = 1"))
+        assert _totals(conn, "c1") == (999 + 2000, line + 2000)
+        assert _totals(conn, "c2") == (2500, 2500)
+
+        conn.execute(text("UPDATE \"order\" SET status = 'cancelled' WHERE id = 2"))
+        assert _totals(conn, "c1") == (999, line)
+        conn.execute(text("UPDATE \"order\" SET comanda_id = 'c2', status = 'open' WHERE id = 2"))
+        assert _totals(conn, "c2") == (4500, 4500)
+
+        conn.execute(text("DELETE FROM order_item WHERE id = 2"))
+        assert _totals(conn, "c1") == (0, 0)
+        assert projections.verify_comanda_totals(conn).ok
+
+        # Writes behind the triggers' back are detected and repaired in bulk.
+        conn.execute(text("UPDATE comanda SET total_cents = 1 WHERE id = 'c2'"))
+        conn.execute(text("UPDATE order_item SET total_cents = NULL WHERE id = 1"))
+        report = projections.verify_comanda_totals(conn)
+        assert report.lines == 1
+        assert [(d.key, d.stored_total, d.expected_total) for d in report.drift] == [("c2", 1, 4500)]
+        assert projections.verify_comanda_totals(conn, repair=True).drift
+        assert all(r.ok for r in projections.verify_all(conn))
+        assert _totals(conn, "c2") == (4500, 4500)
+
+    sync = importlib.import_module(f"{generated.__name__}.sync")
+    assert sync.DERIVED_COLUMNS["comanda"] == ("subtotal_cents", "total_cents")
+
+
+def test_line_total_matches_sqlite_rounding(generated, engine) -> None:
+    projections = importlib.import_module(f"{generated.__name__}.projections")
+    cases = [(1, 999, 10.0, 12.5), (3, 333, 33.33, 0.05), (7, 1, 0.5, 0.5), (1, 0, None, None), (2, 1995, None, 17.0)]
+    with engine.connect() as conn:
+        for quantity, price, discount, tax in cases:
+            expected = conn.execute(
+                text(
+                    "SELECT (:q * :p * (10000 - CAST(ROUND(COALESCE(:d, 0) * 100) AS INTEGER))"
+                    " * (10000 + CAST(ROUND(COALESCE(:t, 0) * 100) AS INTEGER)) + 50000000) / 100000000"
+                ),
+                {"q": quantity, "p": price, "d": discount, "t": tax},
+            ).scalar()
+            assert projections.line_total_cents(quantity, price, discount, tax) == expected
+
+
+def test_stock_ledger_tracks_movements_snapshots_and_consumption(generated, engine) -> None:
+    projections = importlib.import_module(f"{generated.__name__}.projections")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+
+    def stock(conn):
+        return dict(conn.execute(text("SELECT id, stock_current FROM product ORDER BY id")).all())
+
+    with engine.begin() as conn:
+        repositories.ProductRepository(conn).bulk_insert(
+            [{"id": 1, "name": "cachaca", "stock_current": 10.0}, {"id": 2, "name": "lime"}, {"id": 3, "name": "ice"}]
+        )
+        repositories.ItemRepository(conn).bulk_insert([{"id": 1, "name": "caipirinha", "item_type": "drink"}])
+        repositories.ItemProductRepository(conn).bulk_insert(
+            [
+                {"item_id": 1, "product_id": 1, "quantity": 0.05},
+                {"item_id": 1, "product_id": 2, "quantity": 1.0},
+            ]
+        )
+        # Opening balances set directly are captured by the first snapshot.
+        assert projections.take_stock_ledger_snapshot(conn) == 3
+        assert projections.take_stock_ledger_snapshot(conn) == 0
+
+        repositories.StockMovementRepository(conn).bulk_insert(
+            [
+                {"product_id": 2, "quantity": 50.0, "movement_type": "in"},
+                {"product_id": 3, "quantity": -2.0, "movement_type": "adjustment"},
+            ]
+        )
+        repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+        repositories.OrderRepository(conn).bulk_insert([{"id": 1, "comanda_id": "c1", "origin": "table", "status": "open"}])
+        repositories.OrderItemRepository(conn).bulk_insert(
+            [{"id": i, "order_id": 1, "item_id": 1, "quantity": 2, "unit_price_cents": 1800} for i in range(1, 4)]
+        )
+        assert projections.consume_for_order_items(conn, [1, 2, 3], chunk_size=2) == 6
+        assert projections.consume_for_order_items(conn, [1, 2, 3]) == 0  # already consumed
+        assert stock(conn) == pytest.approx({1: 10.0 - 0.3, 2: 50.0 - 6.0, 3: -2.0})
+        assert projections.verify_stock_ledger(conn).ok
+
+        first_out = conn.execute(text("SELECT MIN(id) FROM stock_movement WHERE movement_type = 'out'")).scalar()
+        assert projections.stock_ledger_balances(conn, [2], at_movement=first_out - 1) == {2: 50.0}
+        assert projections.take_stock_ledger_snapshot(conn) == 3
+        assert projections.stock_ledger_balances(conn, [1, 2]) == pytest.approx({1: 9.7, 2: 44.0})
+
+        with pytest.raises(Exception, match="immutable"):
+            conn.execute(text("DELETE FROM stock_movement WHERE id = :id"), {"id": first_out})
+
+        conn.execute(text("UPDATE product SET stock_current = 0 WHERE id = 1"))
+        report = projections.verify_stock_ledger(conn, repair=True)
+        assert [(d.key, d.expected) for d in report.drift] == [(1, pytest.approx(9.7))]
+        assert projections.verify_stock_ledger(conn).ok
+
+        plan = " ".join(
+            str(row[-1])
+            for row in conn.execute(
+                text("EXPLAIN QUERY PLAN SELECT SUM(quantity) FROM stock_movement WHERE product_id = 1 AND id > 5")
+            )
+        )
+        assert "idx_stock_movement_product_id" in plan and "rowid>?" in plan
@@ -0,0 +1,97 @@
+import asyncio
+import importlib
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+
+def _seed(conn, repositories, tickets: int = 4) -> None:
+    repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+    repositories.OrderRepository(conn).bulk_insert([{"id": 1, "comanda_id": "c1", "origin": "table", "status": "open"}])
+    start = datetime(2024, 5, 1, 20, 0)
+    repositories.KitchenTicketRepository(conn).bulk_insert(
+        [
+            {"id": i, "order_id": 1, "status": "new", "created_at": start + timedelta(minutes=tickets - i)}
+            for i in range(1, tickets + 1)
+        ]
+    )
+
+
+def test_claim_and_advance_move_tickets_along_the_flow(generated, engine) -> None:
+    queue = importlib.import_module(f"{generated.__name__}.kitchen_queue")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    assert queue.FLOW == ("new", "cooking", "ready", "delivered")
+
+    with engine.begin() as conn:
+        _seed(conn, repositories)
+        # Oldest first: ticket 4 was created first.
+        assert [row.id for row in queue.pending(conn)] == [4, 3, 2, 1]
+        claimed = queue.claim_next(conn, 2)
+        assert [(row.id, row.status.value) for row in claimed] == [(4, "cooking"), (3, "cooking")]
+        assert [row.id for row in queue.claim_next(conn, 1)] == [2]
+
+        assert queue.advance_many(conn, [4, 4, 1, 99], chunk_size=1) == {4: "ready", 1: "cooking"}
+        assert queue.move_many(conn, [3, 4], "ready") == [3]
+        assert queue.move_many(conn, [3], "new") == []
+        assert queue.advance_many(conn, [4]) == {4: "delivered"}
+        assert queue.advance_many(conn, [4]) == {}
+
+        board = queue.board(conn)
+        assert {status: [row.id for row in rows] for status, rows in board.items()} == {
+            "new": [],
+            "cooking": [2, 1],
+            "ready": [3],
+        }
+        depth = queue.depth(conn)
+        assert (depth["cooking"].count, depth["new"].count) == (2, 0)
+        assert depth["cooking"].age(datetime(2024, 5, 1, 20, 10)) == 480.0
+        assert depth["new"].age() == 0.0
+
+        with pytest.raises(ValueError):
+            queue.pending(conn, "burnt")
+
+
+def test_queue_reads_use_partial_indexes(generated, engine) -> None:
+    with engine.connect() as conn:
+        for status in ("new", "cooking", "ready"):
+            plan = " ".join(
+                str(row[-1])
+                for row in conn.execute(
+                    text(
+                        "EXPLAIN QUERY PLAN SELECT id FROM kitchen_ticket"
+                        f" WHERE status = '{status}' ORDER BY created_at, id LIMIT 5"
+                    )
+                )
+            )
+            assert f"idx_kitchen_ticket_kitchen_queue_{status}" in plan
+            assert "TEMP B-TREE" not in plan
+
+
+def test_wait_for_changes_wakes_on_commit(generated, engine) -> None:
+    queue = importlib.import_module(f"{generated.__name__}.kitchen_queue")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    waiter = queue.changes(engine, poll_interval=5.0)
+    try:
+        since = waiter.version()
+        assert waiter.wait_for_changes(since, timeout=0.05) == since
+
+        def write() -> None:
+            with engine.begin() as conn:
+                _seed(conn, repositories, tickets=2)
+
+        writer = threading.Timer(0.05, write)
+        writer.start()
+        started = datetime.now()
+        version = waiter.wait_for_changes(since, timeout=5.0)
+        writer.join()
+        assert version > since
+        # Woken by the commit hook, well before the 5s poll interval.
+        assert (datetime.now() - started).total_seconds() < 2.0
+
+        with engine.begin() as conn:
+            queue.claim_next(conn)
+        assert asyncio.run(waiter.wait_for_changes_async(version, timeout=1.0)) > version
+    finally:
+        waiter.close()
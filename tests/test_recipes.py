@@ -0,0 +1,76 @@
+import importlib
+
+import pytest
+from sqlalchemy import text
+
+
+def _seed(conn, repositories) -> None:
+    repositories.ProductRepository(conn).bulk_insert(
+        [
+            {"id": 1, "name": "cachaca", "cost_price_cents": 4000},
+            {"id": 2, "name": "lime", "cost_price_cents": 50},
+            {"id": 3, "name": "sugar", "cost_price_cents": 10},
+            {"id": 4, "name": "napkin"},
+        ]
+    )
+    repositories.ItemRepository(conn).bulk_insert(
+        [
+            {"id": 1, "name": "caipirinha", "item_type": "drink"},
+            {"id": 2, "name": "lime juice", "item_type": "drink"},
+            {"id": 3, "name": "souvenir", "item_type": "article"},
+        ]
+    )
+    repositories.ItemProductRepository(conn).bulk_insert(
+        [
+            {"item_id": 1, "product_id": 1, "quantity": 0.05},
+            {"item_id": 1, "product_id": 2, "quantity": 1.0},
+            {"item_id": 1, "product_id": 3, "quantity": 2.0},
+            {"item_id": 2, "product_id": 2, "quantity": 3.0},
+            {"item_id": 2, "product_id": 4, "quantity": 1.0},
+        ]
+    )
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_recipe_cache_expands_and_costs_without_queries(generated, engine, monkeypatch, vectorized) -> None:
+    recipes = importlib.import_module(f"{generated.__name__}.recipes")
+    counters = importlib.import_module(f"{generated.__name__}.counters")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    if not vectorized:
+        monkeypatch.setattr(recipes, "np", None)
+
+    cache = recipes.RecipesCache()
+    with engine.begin() as conn:
+        _seed(conn, repositories)
+        assert cache.refresh(conn) is True
+        assert cache.refresh(conn) is False
+        assert counters.read_versions(conn) == {"item_product": 5, "product": 4, "kitchen_ticket": 0}
+
+    assert cache.components(1) == [(1, 0.05), (2, 1.0), (3, 2.0)]
+    assert cache.components(3) == [] and cache.components(99) == []
+    assert cache.unit_cost(1) == pytest.approx(200 + 50 + 20)
+    assert list(cache.costs([1, 2, 3, 99], [2, 1, 5, 1])) == pytest.approx([540, 150, 0, 0])
+    assert cache.total_cost([1, 1, 2]) == pytest.approx(690)
+    assert cache.expand([1, 2, 3, 1], [1, 2, 1, 3]) == pytest.approx({1: 0.2, 2: 10.0, 3: 8.0, 4: 2.0})
+    assert cache.expand([3, 99]) == {}
+
+    with engine.begin() as conn:
+        # Stock changes do not invalidate the cache; cost and recipe changes do.
+        conn.execute(text("UPDATE product SET stock_current = 5 WHERE id = 1"))
+        assert cache.refresh(conn) is False
+        conn.execute(text("UPDATE product SET cost_price_cents = 100 WHERE id = 2"))
+        assert cache.refresh(conn) is True
+        assert cache.unit_cost(2) == pytest.approx(300)
+        conn.execute(text("DELETE FROM item_product WHERE item_id = 2 AND product_id = 4"))
+        assert cache.refresh(conn) is True
+        assert cache.components(2) == [(2, 3.0)]
+
+
+def test_recipe_cache_handles_empty_tables(generated, engine) -> None:
+    recipes = importlib.import_module(f"{generated.__name__}.recipes")
+    cache = recipes.RecipesCache()
+    with engine.connect() as conn:
+        assert cache.refresh(conn) is True
+        assert cache.refresh(conn) is False
+    assert cache.expand([1, 2]) == {}
+    assert list(cache.costs([1])) == [0]
@@ -0,0 +1,164 @@
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import yaml
+from sqlalchemy import text
+
+from botecopro_meta.generator import DomainLoader
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+T0 = datetime(2024, 5, 1, 9)
+
+
+def _seed(repositories, conn) -> None:
+    repositories.ItemRepository(conn).bulk_insert(
+        [{"id": i, "name": f"item {i}", "item_type": "drink"} for i in (1, 2, 3)]
+    )
+    repositories.ProductRepository(conn).bulk_insert([{"id": 7, "name": "limes", "stock_current": 50.0}])
+    repositories.ComandaRepository(conn).bulk_insert([{"id": "c1", "status": "open"}])
+    repositories.OrderRepository(conn).bulk_insert(
+        [
+            {"id": 1, "comanda_id": "c1", "origin": "table", "status": "delivered",
+             "created_at": datetime(2024, 5, 1, 20, 15), "last_modified": T0},
+            {"id": 2, "comanda_id": "c1", "origin": "table", "status": "open",
+             "created_at": datetime(2024, 5, 1, 22, 5), "last_modified": T0},
+            {"id": 3, "comanda_id": "c1", "origin": "table", "status": "cancelled",
+             "created_at": datetime(2024, 5, 2, 21, 0), "last_modified": T0},
+            {"id": 4, "comanda_id": "c1", "origin": "delivery", "status": "open",
+             "created_at": datetime(2024, 5, 2, 12, 30), "last_modified": T0},
+        ]
+    )
+    repositories.OrderItemRepository(conn).bulk_insert(
+        [
+            {"id": 1, "order_id": 1, "item_id": 1, "quantity": 2, "unit_price_cents": 1000, "last_modified": T0},
+            {"id": 2, "order_id": 1, "item_id": 2, "quantity": 1, "unit_price_cents": 2500, "last_modified": T0},
+            {"id": 3, "order_id": 2, "item_id": 1, "quantity": 3, "unit_price_cents": 1000, "last_modified": T0},
+            {"id": 4, "order_id": 3, "item_id": 3, "quantity": 9, "unit_price_cents": 9999, "last_modified": T0},
+            {"id": 5, "order_id": 4, "item_id": 3, "quantity": 1, "unit_price_cents": 4000,
+             "discount_percent": 10.0, "last_modified": T0},
+        ]
+    )
+    repositories.PaymentRepository(conn).bulk_insert(
+        [
+            {"id": 1, "comanda_id": "c1", "method": "pix", "amount_cents": 4500, "received_at": datetime(2024, 5, 1, 23)},
+            {"id": 2, "comanda_id": "c1", "method": "cash", "amount_cents": 3000, "received_at": datetime(2024, 5, 1, 23)},
+            {"id": 3, "comanda_id": "c1", "method": "pix", "amount_cents": 3600, "received_at": datetime(2024, 5, 2, 13)},
+        ]
+    )
+    repositories.StockMovementRepository(conn).bulk_insert(
+        [
+            {"id": 1, "product_id": 7, "quantity": -1.5, "movement_type": "adjustment",
+             "created_at": datetime(2024, 5, 1, 23, 50)},
+            {"id": 2, "product_id": 7, "quantity": 4.0, "movement_type": "adjustment",
+             "created_at": datetime(2024, 5, 1, 23, 55)},
+            {"id": 3, "product_id": 7, "quantity": 5.0, "movement_type": "out",
+             "created_at": datetime(2024, 5, 2, 10)},
+        ]
+    )
+
+
+def test_reports_group_exported_columns_per_day(generated, engine, tmp_path: Path) -> None:
+    analytics = importlib.import_module(f"{generated.__name__}.analytics")
+    export = importlib.import_module(f"{generated.__name__}.export")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    with engine.begin() as conn:
+        _seed(repositories, conn)
+
+    report = analytics.refresh(engine, tmp_path / "state.json")
+    assert report.revenue_by_day() == {"2024-05-01": 7500, "2024-05-02": 3600}
+    hours = report.revenue_by_hour()
+    assert (hours[20], hours[22], hours[12], sum(hours)) == (4500, 3000, 3600, 11100)
+    assert report.top_items(2) == [(1, 5, 5000), (3, 1, 3600)]
+    assert report.top_items(1, by="quantity") == [(1, 5, 5000)]
+    assert report.payment_mix() == {"cash": (1, 3000), "pix": (2, 8100)}
+    assert report.waste() == {7: 1.5}
+    assert report.between("2024-05-02").revenue_by_day() == {"2024-05-02": 3600}
+
+    for fmt in ("npy", "arrow"):
+        if fmt == "arrow":
+            pytest.importorskip("pyarrow")
+        out = tmp_path / fmt
+        export.export(engine, out, analytics.COLUMNS, fmt=fmt)
+        assert analytics.from_export(out).days == report.days
+
+
+def test_incremental_refresh_recomputes_only_touched_days(generated, engine, tmp_path: Path) -> None:
+    analytics = importlib.import_module(f"{generated.__name__}.analytics")
+    export = importlib.import_module(f"{generated.__name__}.export")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    state = tmp_path / "state.json"
+    with engine.begin() as conn:
+        _seed(repositories, conn)
+    analytics.refresh(engine, state)
+    assert analytics.Report.load(state).watermarks["payment"] == 3
+
+    later = "2024-05-03 08:00:00.000000"
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE order_item SET quantity = 3, last_modified = :at WHERE id = 1"), {"at": later}
+        )
+        conn.execute(
+            text("UPDATE \"order\" SET status = 'cancelled', last_modified = :at WHERE id = 2"),
+            {"at": later},
+        )
+        repositories.PaymentRepository(conn).bulk_insert(
+            [{"id": 4, "comanda_id": "c1", "method": "card", "amount_cents": 100,
+              "received_at": datetime(2024, 5, 3, 1)}]
+        )
+
+    work = tmp_path / "work"
+    report = analytics.refresh(engine, state, work_dir=work, fmt="npy")
+    # Only the touched days were exported again.
+    assert export.load_table(work, "order").rows == 2
+    assert export.load_table(work, "payment").rows == 1
+    assert not (work / "stock_movement").exists()
+    assert report.revenue_by_day() == {"2024-05-01": 5500, "2024-05-02": 3600}
+    assert report.top_items(2) == [(3, 1, 3600), (1, 3, 3000)]
+    assert report.payment_mix()["card"] == (1, 100)
+    assert report.waste() == {7: 1.5}
+    assert report.days == analytics.refresh(engine, tmp_path / "full.json", full=True).days
+
+    untouched = state.read_text()
+    assert analytics.refresh(engine, state).days == report.days
+    assert state.read_text() == untouched
+
+
+def test_incremental_refresh_sees_new_movements(generated, engine, tmp_path: Path) -> None:
+    analytics = importlib.import_module(f"{generated.__name__}.analytics")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    state = tmp_path / "state.json"
+    with engine.begin() as conn:
+        _seed(repositories, conn)
+    analytics.refresh(engine, state)
+
+    with engine.begin() as conn:
+        repositories.StockMovementRepository(conn).bulk_insert(
+            [{"product_id": 7, "quantity": -2.0, "movement_type": "adjustment",
+              "created_at": datetime(2024, 5, 1, 23, 59)}]
+        )
+    assert analytics.refresh(engine, state).waste() == {7: 3.5}
+    assert analytics.refresh(engine, tmp_path / "full.json", full=True).waste() == {7: 3.5}
+
+
+def test_report_command_prints_a_summary(generated, engine, tmp_path: Path, capsys) -> None:
+    analytics = importlib.import_module(f"{generated.__name__}.analytics")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    with engine.begin() as conn:
+        _seed(repositories, conn)
+
+    analytics.main(
+        ["--database", str(tmp_path / "boteco.db"), "--state", str(tmp_path / "s.json"), "--top", "1"]
+    )
+    output = capsys.readouterr().out
+    assert '"top_items": [\n    [\n      1,' in output and '"2024-05-02": 3600' in output
+
+
+def test_report_sales_must_name_a_totals_projection(tmp_path: Path) -> None:
+    data = yaml.safe_load(DOMAIN_PATH.read_text())
+    data["botecopro_domain"]["reports"]["analytics"]["sales"] = "stock_ledger"
+    path = tmp_path / "domain.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+    with pytest.raises(ValueError, match="Report analytics: sales must name a totals projection"):
+        DomainLoader(path).load()
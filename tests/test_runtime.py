@@ -0,0 +1,128 @@
+from pathlib import Path
+import importlib
+
+from sqlalchemy import text
+
+
+def test_database_engine_applies_configured_pragmas(generated, tmp_path: Path) -> None:
+    database = importlib.import_module(f"{generated.__name__}.database")
+    engine = database.create_engine(f"sqlite:///{tmp_path / 'pos.db'}")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -16000
+
+    overridden = database.create_engine(
+        f"sqlite:///{tmp_path / 'other.db'}", pragmas={"synchronous": "full"}
+    )
+    with overridden.connect() as conn:
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 2
+
+    Session = database.create_sessionmaker(engine)
+    with Session() as session:
+        assert session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_commit_signal_fires_once_the_commit_is_visible(generated, engine, tmp_path: Path) -> None:
+    database = importlib.import_module(f"{generated.__name__}.database")
+    reader = database.create_engine(f"sqlite:///{tmp_path / 'boteco.db'}")
+    seen = []
+
+    def count() -> None:
+        with reader.connect() as conn:
+            seen.append(conn.execute(text("SELECT COUNT(*) FROM category")).scalar())
+
+    signal = database.CommitSignal(engine, count)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO category (name) VALUES ('drinks')"))
+        with engine.connect() as conn:  # committed twice on one connection
+            conn.execute(text("INSERT INTO category (name) VALUES ('food')"))
+            conn.commit()
+            conn.execute(text("INSERT INTO category (name) VALUES ('snacks')"))
+            conn.commit()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT COUNT(*) FROM category"))
+        assert seen == [1, 2, 3]
+    finally:
+        signal.close()
+        reader.dispose()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO category (name) VALUES ('closed')"))
+    assert seen == [1, 2, 3]
+
+
+def test_repositories_bulk_insert_upsert_and_read(generated, engine) -> None:
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+
+    with engine.begin() as conn:
+        categories = repositories.CategoryRepository(conn)
+        assert categories.bulk_insert([{"name": f"cat {i}"} for i in range(1, 6)], chunk_size=2) == 5
+
+        products = repositories.ProductRepository(conn)
+        products.bulk_insert(
+            [{"id": i, "name": f"product {i}", "stock_current": 10.0} for i in range(1, 1201)]
+        )
+        products.bulk_upsert(
+            [{"id": 1, "name": "lime", "stock_current": 2.5}, {"id": 5000, "name": "ice"}],
+        )
+        products.bulk_upsert([{"id": 2, "name": "ignored"}], update_columns=[])
+
+        items = repositories.ItemRepository(conn)
+        items.bulk_insert([{"id": 1, "name": "caipirinha", "item_type": "drink"}])
+        recipe = repositories.ItemProductRepository(conn)
+        recipe.bulk_insert(
+            [
+                {"item_id": 1, "product_id": 1, "quantity": 1.0},
+                {"item_id": 1, "product_id": 2, "quantity": 0.05},
+            ]
+        )
+        recipe.bulk_upsert([{"item_id": 1, "product_id": 2, "quantity": 0.06}])
+
+    with engine.connect() as conn:
+        products = repositories.ProductRepository(conn)
+        found = products.get_many([1, 2, 5000, 9999])
+        assert set(found) == {1, 2, 5000}
+        assert found[2].name == "product 2"
+        assert found[1].name == "lime" and found[1].stock_current == 2.5
+        assert found[5000].active is True
+
+        batches = list(products.iter_all(batch_size=500))
+        assert [len(batch) for batch in batches] == [500, 500, 201]
+        assert [row.id for batch in batches for row in batch][-2:] == [1200, 5000]
+
+        recipe = repositories.ItemProductRepository(conn)
+        rows = recipe.get_many([(1, 2), (1, 3)])
+        assert list(rows) == [(1, 2)] and rows[(1, 2)].quantity == 0.06
+        assert [len(b) for b in recipe.iter_all(batch_size=1)] == [1, 1]
+
+        assert conn.execute(
+            text("SELECT item_type FROM item WHERE id = 1")
+        ).scalar() == "drink"
+
+
+def test_repository_records_are_typed_tuples(generated, engine) -> None:
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    enums = importlib.import_module(f"{generated.__name__}.enums")
+    Item = generated.Item
+
+    with engine.begin() as conn:
+        items = repositories.ItemRepository(conn)
+        items.bulk_insert(
+            [
+                {"id": 1, "name": "caipirinha", "item_type": "drink", "sale_price_cents": 1800},
+                {"id": 2, "name": "pastel", "item_type": "dish", "active": False},
+            ]
+        )
+        menu = items.records(items.record_select().where(Item.active.is_(True)).order_by(Item.name))
+        (record,) = menu
+        assert type(record) is repositories.ItemRecord
+        assert record._fields[:3] == ("id", "name", "description")
+        assert (record.id, record.name, record.sale_price_cents) == (1, "caipirinha", 1800)
+        assert record.item_type is enums.ItemType.DRINK
+        assert not hasattr(record, "__dict__")
+        assert [r.id for r in items.records()] == [1, 2]
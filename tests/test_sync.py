@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+import importlib
+
+import pytest
+from sqlalchemy import text
+
+
+def test_push_streams_dirty_rows_with_last_writer_wins(generated, make_engine) -> None:
+    sync = importlib.import_module(f"{generated.__name__}.sync")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    tablet = make_engine("tablet.db")
+    server = make_engine("server.db")
+    t0 = datetime(2024, 5, 10, 20, 0, 0)
+
+    assert set(sync.SYNC_TABLES) == {"product", "item", "comanda", "order", "order_item", "stock_movement"}
+
+    with tablet.begin() as conn:
+        repositories.ProductRepository(conn).bulk_insert(
+            [
+                {"id": i, "name": f"p{i}", "last_modified": t0 + timedelta(seconds=i), "dirty": True}
+                for i in range(1, 8)
+            ]
+            + [{"id": 8, "name": "clean", "last_modified": t0, "dirty": False}]
+            + [{"id": 9, "name": "no stamp", "dirty": True}]
+        )
+        repositories.ComandaRepository(conn).bulk_insert(
+            [{"id": "c-1", "status": "open", "last_modified": t0, "dirty": True}]
+        )
+    with server.begin() as conn:
+        # The server already holds a newer edit of product 3 and an older one of 4.
+        repositories.ProductRepository(conn).bulk_insert(
+            [
+                {"id": 3, "name": "server p3", "last_modified": t0 + timedelta(hours=1)},
+                {"id": 4, "name": "stale p4", "last_modified": t0 - timedelta(hours=1)},
+            ]
+        )
+
+    with tablet.connect() as conn:
+        batches = list(sync.iter_dirty_batches(conn, "product", batch_size=3))
+        assert [len(batch.rows) for batch in batches] == [1, 3, 3, 1]
+        ids = [row[0] for batch in batches for row in batch.rows]
+        assert ids == [9, 1, 2, 3, 4, 5, 6, 7]
+        decoded = sync.SyncBatch.decode(batches[1].encode())
+        assert decoded.rows == batches[1].rows
+
+    with tablet.begin() as source, server.begin() as target:
+        sent = sync.push(source, target, batch_size=3)
+    assert sent["product"] == 8 and sent["comanda"] == 1 and sent["order"] == 0
+
+    with server.connect() as conn:
+        names = dict(conn.execute(text("SELECT id, name FROM product")).all())
+        assert names[3] == "server p3"
+        assert names[4] == "p4"
+        assert names[9] == "no stamp"
+        assert 8 not in names
+        assert conn.execute(text("SELECT status FROM comanda")).scalar() == "open"
+        assert conn.execute(text("SELECT COUNT(*) FROM product WHERE dirty")).scalar() == 0
+
+    with tablet.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM product WHERE dirty")).scalar() == 0
+        assert list(sync.iter_dirty_batches(conn, "product")) == []
+
+
+def test_mark_clean_keeps_rows_edited_after_they_were_read(generated, engine) -> None:
+    sync = importlib.import_module(f"{generated.__name__}.sync")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    t0 = datetime(2024, 5, 10, 20, 0, 0)
+
+    with engine.begin() as conn:
+        repositories.ProductRepository(conn).bulk_insert(
+            [{"id": i, "name": f"p{i}", "last_modified": t0, "dirty": True} for i in (1, 2)]
+        )
+        (batch,) = sync.iter_dirty_batches(conn, "product")
+        conn.execute(
+            text("UPDATE product SET last_modified = :ts WHERE id = 2"),
+            {"ts": "2024-05-10 21:00:00.000000"},
+        )
+        assert sync.mark_clean(conn, batch) == 1
+        remaining = list(sync.iter_dirty_batches(conn, "product"))
+        assert [row[0] for row in remaining[0].rows] == [2]
+
+
+def test_push_appends_stock_movements_from_several_devices(generated, make_engine) -> None:
+    sync = importlib.import_module(f"{generated.__name__}.sync")
+    projections = importlib.import_module(f"{generated.__name__}.projections")
+    repositories = importlib.import_module(f"{generated.__name__}.repositories")
+    tablet_a, tablet_b, server = (make_engine(f"{name}.db") for name in ("a", "b", "server"))
+    t0 = datetime(2024, 5, 10, 20, 0, 0)
+
+    def stock(conn):
+        return dict(conn.execute(text("SELECT id, stock_current FROM product ORDER BY id")).all())
+
+    assert sync.DERIVED_COLUMNS["product"] == ("stock_current",)
+    assert sync.APPEND_ONLY == {"stock_movement": "uid"}
+    for engine in (tablet_a, tablet_b, server):
+        with engine.begin() as conn:
+            repositories.ProductRepository(conn).bulk_insert(
+                [{"id": 1, "name": "lime", "last_modified": t0}, {"id": 2, "name": "rum", "last_modified": t0}]
+            )
+
+    # Both tablets number their first movement 1.
+    with tablet_a.begin() as conn:
+        repositories.StockMovementRepository(conn).bulk_insert(
+            [{"product_id": 1, "quantity": 10.0, "movement_type": "in"}]
+        )
+        repositories.ItemRepository(conn).bulk_insert(
+            [{"id": 1, "name": "caipirinha", "item_type": "drink", "last_modified": t0, "dirty": True}]
+        )
+        repositories.ItemProductRepository(conn).bulk_insert([{"item_id": 1, "product_id": 1, "quantity": 0.5}])
+        repositories.ComandaRepository(conn).bulk_insert(
+            [{"id": "c1", "status": "open", "last_modified": t0, "dirty": True}]
+        )
+        repositories.OrderRepository(conn).bulk_insert(
+            [{"id": 1, "comanda_id": "c1", "origin": "table", "status": "open", "last_modified": t0, "dirty": True}]
+        )
+        repositories.OrderItemRepository(conn).bulk_insert(
+            [{"id": 1, "order_id": 1, "item_id": 1, "quantity": 4, "unit_price_cents": 1800,
+              "last_modified": t0, "dirty": True}]
+        )
+        assert projections.consume_for_order_items(conn, [1], created_at=t0) == 1
+    with tablet_b.begin() as conn:
+        repositories.StockMovementRepository(conn).bulk_insert(
+            [{"product_id": 2, "quantity": 3.0, "movement_type": "in"}]
+        )
+        assert conn.execute(text("SELECT id FROM stock_movement")).scalar() == 1
+
+    with tablet_a.begin() as source, server.begin() as target:
+        assert sync.push(source, target)["stock_movement"] == 2
+    with server.begin() as conn:
+        assert projections.take_stock_ledger_snapshot(conn) == 2
+    with tablet_b.connect() as source:
+        (batch,) = sync.iter_dirty_batches(source, "stock_movement")
+        assert "id" not in batch.columns
+    with tablet_b.begin() as source, server.begin() as target:
+        assert sync.push(source, target)["stock_movement"] == 1
+        assert sync.apply_batch(target, sync.SyncBatch.decode(batch.encode())) == 0  # replayed
+
+    with server.connect() as conn:
+        assert stock(conn) == {1: pytest.approx(8.0), 2: pytest.approx(3.0)}
+        assert conn.execute(text("SELECT COUNT(*) FROM stock_movement WHERE dirty")).scalar() == 0
+    for engine in (tablet_a, tablet_b, server):
+        with engine.connect() as conn:
+            assert projections.verify_stock_ledger(conn).ok
+            assert not list(sync.iter_dirty_batches(conn, "stock_movement"))
+
+    # Sent movements are facts; a later product edit does not carry its balance.
+    with tablet_a.begin() as conn:
+        with pytest.raises(Exception, match="synchronised stock_movement rows are immutable"):
+            conn.execute(text("UPDATE stock_movement SET quantity = 1 WHERE id = 1"))
+    with tablet_a.begin() as conn:
+        conn.execute(
+            text("UPDATE product SET name = 'tahiti lime', dirty = 1, last_modified = :ts WHERE id = 1"),
+            {"ts": "2024-05-10 21:00:00.000000"},
+        )
+    with tablet_a.begin() as source, server.begin() as target:
+        assert {name: n for name, n in sync.push(source, target).items() if n} == {"product": 1}
+    with server.connect() as conn:
+        assert stock(conn)[1] == pytest.approx(8.0)
+        assert conn.execute(text("SELECT name FROM product WHERE id = 1")).scalar() == "tahiti lime"
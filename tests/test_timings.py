@@ -0,0 +1,63 @@
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from botecopro_meta.generator import generate, main
+from botecopro_meta.timings import PHASES, Timings
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def test_timings_cover_phases_templates_and_entities(tmp_path: Path) -> None:
+    output_dir = tmp_path / "generated"
+    timings = Timings()
+    report = generate(DOMAIN_PATH, output_dir, timings=timings)
+    summary = timings.summary()
+
+    assert set(summary["phases"]) == set(PHASES)
+    assert summary["total_seconds"] >= summary["phases"]["render"] > 0
+    assert summary["templates"]["python_model.j2"]["calls"] >= len(summary["entities"])
+    assert summary["bytes_written"] == sum(path.stat().st_size for path in report.written)
+    assert summary["files"] == {"written": len(report.written), "unchanged": 0, "removed": 0}
+    product = summary["entities"]["Product"]
+    assert product["files"] == 4  # model, repository, table and dart class
+    units = {unit["key"]: unit for unit in summary["units"]}
+    assert units["sql:Product"]["target"] == "sqlite" and units["sql:Product"]["written"] == 1
+
+    again = Timings()
+    generate(DOMAIN_PATH, output_dir, timings=again)
+    summary = again.summary()
+    assert "render" not in summary["phases"] and "parse" not in summary["phases"]
+    assert "entity:Product" in summary["skipped"] and summary["bytes_written"] == 0
+
+
+def test_command_writes_json_summary_and_profile(tmp_path: Path, capsys) -> None:
+    stats_path = tmp_path / "run.pstats"
+    json_path = tmp_path / "timings.json"
+    main(
+        [
+            "--input", str(DOMAIN_PATH),
+            "--out", str(tmp_path / "generated"),
+            "--target", "sqlite",
+            "--timings", str(json_path),
+            "--profile", str(stats_path),
+        ]
+    )
+    captured = capsys.readouterr()
+    assert "sqlite_table.j2" in captured.err and "cumulative" in captured.err
+    assert captured.out.startswith("Generated ")
+
+    summary = json.loads(json_path.read_text())
+    assert set(summary["templates"]) == {"sqlite_table.j2", "sqlite_schema.j2"}
+    assert "Product" in summary["entities"]
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+
+
+def test_command_rejects_timings_with_watch(tmp_path: Path, capsys) -> None:
+    for flag in (["--timings"], ["--profile", str(tmp_path / "run.pstats")]):
+        with pytest.raises(SystemExit):
+            main(["--input", str(DOMAIN_PATH), "--out", str(tmp_path / "generated"), "--watch", *flag])
+        assert "--watch" in capsys.readouterr().err
+    assert not (tmp_path / "generated").exists()
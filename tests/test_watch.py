@@ -0,0 +1,115 @@
+from pathlib import Path
+import os
+import shutil
+import threading
+import time
+
+from botecopro_meta import generator as generator_module
+from botecopro_meta.generator import EntityDefinition
+from botecopro_meta.watch import Watcher
+
+DOMAIN_PATH = Path(__file__).resolve().parent.parent / "db-meta" / "schemas" / "001_domain.yaml"
+
+
+def _touch_later(path: Path, text: str) -> None:
+    # Guarantee a new mtime even on filesystems with coarse timestamps.
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_watcher_rerenders_changed_entity_and_fk_dependents(tmp_path: Path) -> None:
+    schema_dir = tmp_path / "db-meta"
+    schema_dir.mkdir()
+    domain_path = schema_dir / "domain.yaml"
+    shutil.copy(DOMAIN_PATH, domain_path)
+    output_dir = tmp_path / "generated"
+
+    watcher = Watcher(domain_path, output_dir, watch_paths=[schema_dir], debounce=0.001)
+    first = watcher.poll()
+    assert first is not None and first.written
+    assert watcher.poll() is None
+
+    text = domain_path.read_text()
+    marker = "    Product:\n      storage:\n        table: product\n      attributes:\n        id:\n          type: int\n"
+    assert marker in text
+    _touch_later(domain_path, text.replace(marker, marker.replace("type: int", "type: uuid")))
+
+    start = time.perf_counter()
+    report = watcher.poll()
+    assert report is not None
+    assert time.perf_counter() - start < 1.0
+
+    assert set(watcher.changed) == {"Product", "SupplierProduct", "ItemProduct", "StockMovement"}
+    assert {path.name for path in report.written} == {
+        "product.py",
+        "supplier_product.py",
+        "supplier_product.sql",
+        "item_product.py",
+        "item_product.sql",
+        "stock_movement.py",
+        "stock_movement.sql",
+        "schema.sql",
+        "export.py",
+        "product.dart",
+        "supplier_product.dart",
+        "item_product.dart",
+        "stock_movement.dart",
+    }
+    assert "entity:Category" in report.skipped
+
+
+def test_watcher_reuses_its_pool_and_digests(tmp_path: Path, monkeypatch) -> None:
+    schema_dir = tmp_path / "db-meta"
+    schema_dir.mkdir()
+    domain_path = schema_dir / "domain.yaml"
+    shutil.copy(DOMAIN_PATH, domain_path)
+
+    watcher = Watcher(domain_path, tmp_path / "generated", jobs=2, watch_paths=[schema_dir])
+    try:
+        watcher.regenerate()
+        pool = watcher._executor
+        assert pool is not None
+
+        digested = []
+        monkeypatch.setattr(generator_module, "content_digest", lambda *parts: digested.append(parts) or "x")
+        text = domain_path.read_text()
+        marker = "        table: supplier\n      attributes:\n"
+        _touch_later(domain_path, text.replace(marker, marker + "        rating:\n          type: int\n", 1))
+        watcher.regenerate()
+        monkeypatch.undo()
+
+        assert watcher._executor is pool
+        entities = [part for parts in digested for part in parts if isinstance(part, EntityDefinition)]
+        assert [entity.name for entity in entities] == ["Supplier"]
+    finally:
+        watcher.close()
+    assert watcher._executor is None
+
+
+def test_run_survives_an_invalid_domain_at_startup(tmp_path: Path, capsys) -> None:
+    schema_dir = tmp_path / "db-meta"
+    schema_dir.mkdir()
+    domain_path = schema_dir / "domain.yaml"
+    domain_path.write_text("domain: [unclosed\n")
+    output_dir = tmp_path / "generated"
+
+    watcher = Watcher(domain_path, output_dir, watch_paths=[schema_dir], interval=0.01, debounce=0.001)
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop,))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        output = ""
+        while "Error:" not in output and time.monotonic() < deadline:
+            time.sleep(0.01)
+            output += capsys.readouterr().out
+        assert "Error:" in output and thread.is_alive()
+
+        _touch_later(domain_path, DOMAIN_PATH.read_text())
+        while not (output_dir / "sql" / "schema.sql").exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        thread.join()
+    assert (output_dir / "sql" / "schema.sql").exists()